@@ -1,68 +1,312 @@
-def enumerate(iterable, start=0):
-    # Initialize the counter
-    count = start
-    # Loop through the iterable
-    for item in iterable:
-        yield count, item  # Yield the index and the item
-        count += 1  # Increment the counter
-
-def merge_minterms(minterm1: str, minterm2: str) -> str:
-    """
-    Merges two minterms by comparing each bit position.
-    If bits are the same, keeps the bit.
-    If bits differ, replaces with a dash ('-').
-    
+import argparse
+import collections
+import concurrent.futures
+import functools
+import itertools
+import json
+import math
+import mmap
+import os
+import shelve
+import signal
+import sys
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import kmap_bdd
+
+# The dense engine is used for functions up to this size whose care set is at least this dense
+DENSE_ENGINE_MAX_BITS = 14
+DENSE_ENGINE_MIN_DENSITY = 0.3
+
+# Independent blocks of a cover chart with fewer rows are not worth sending to another process
+PARALLEL_COMPONENT_MIN_ROWS = 32
+
+# The cache only canonicalizes (see canonicalize_table) functions with at least this many
+# variables; smaller ones solve about as fast as they are canonicalized and looked up
+NPN_MIN_BITS = 5
+
+# Which part of a function each PLA output value describes ('~' describes nothing)
+PLA_OUTPUT_KINDS = {'1': 'f', '0': 'r', '-': 'd', '2': 'd', '~': ''}
+
+# Largest number of variables a batch request may ask for (its truth table has 2^bits entries)
+MAX_REQUEST_BITS = 24
+
+def minterm_to_implicant(minterm: str) -> tuple[int, int]:
+    """
+    Converts a minterm string into a (value, mask) integer pair.
+    Bits set in mask are dashes, and their value bits are always 0.
+
+    Args:
+        minterm: Minterm string (e.g., '10-1')
+    Returns:
+        Tuple of value and mask (e.g., (0b1001, 0b0010))
+    """
+    value = 0
+    mask = 0
+    for c in minterm:
+        value <<= 1
+        mask <<= 1
+        if c == '-':
+            mask |= 1
+        elif c == '1':
+            value |= 1
+    return value, mask
+
+def implicant_to_minterm(implicant: tuple[int, int], bits: int) -> str:
+    """
+    Converts a (value, mask) integer pair back into a minterm string.
+
     Args:
-        minterm1: First minterm string (e.g., '1001')
-        minterm2: Second minterm string (e.g., '1011')
+        implicant: Tuple of value and mask (e.g., (0b1001, 0b0010))
+        bits: Number of variables
     Returns:
-        Merged minterm string (e.g., '10-1')
+        Minterm string (e.g., '10-1')
     """
-    merged_minterm = ""
-    for i in range(len(minterm1)):
-        if minterm1[i] == minterm2[i]:
-            merged_minterm += minterm1[i]
+    value, mask = implicant
+    minterm = []
+    for i in range(bits - 1, -1, -1):
+        if (mask >> i) & 1:
+            minterm.append('-')
+        elif (value >> i) & 1:
+            minterm.append('1')
         else:
-            merged_minterm += '-'
-    return merged_minterm
+            minterm.append('0')
+    return ''.join(minterm)
 
-def check_dashes_align(minterm1: str, minterm2: str) -> bool:
+def indices_to_bitset(indices, bits: int) -> int:
     """
-    Checks if dashes in two minterms are in the same positions.
-    Minterms can only be merged if their dashes align.
-    
+    Packs minterm indices into an integer bitset (bit i set = minterm i present).
+    Goes through a bytearray so large tables are not rebuilt one shift at a time.
+
     Args:
-        minterm1: First minterm string (e.g., '10-1')
-        minterm2: Second minterm string (e.g., '1-11')
+        indices: Iterable of minterm integers
+        bits: Number of variables
     Returns:
-        True if dashes align, False otherwise (e.g., False for '10-1' and '1-11')
+        Packed bitset
     """
-    for i in range(len(minterm1)):
-        if minterm1[i] != '-' and minterm2[i] == '-':
-            return False
-        elif minterm1[i] == '-' and minterm2[i] != '-':
-            return False
-    return True
+    data = bytearray(((1 << bits) + 7) // 8)
+    for index in indices:
+        data[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(data, 'little')
 
-def check_minterm_differences(minterm1: str, minterm2: str) -> bool:
+def bitset_to_indices(bitset: int) -> list[int]:
     """
-    Checks if two minterms differ in exactly one position (excluding dashes).
-    Converts minterms to integers and uses bitwise operations to check.
-    
+    Unpacks an integer bitset into a sorted list of minterm indices.
+
+    Args:
+        bitset: Packed bitset
+    Returns:
+        List of minterm integers
+    """
+    indices = []
+    if bitset.bit_count() * 32 <= bitset.bit_length():
+        # Few bits: peeling them off costs less than visiting every byte
+        while bitset:
+            low = bitset & -bitset
+            indices.append(low.bit_length() - 1)
+            bitset ^= low
+        return indices
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            indices.append((byte_index << 3) | (low.bit_length() - 1))
+            byte ^= low
+    return indices
+
+class TruthTable:
+    """ Boolean function stored as packed on-set and don't-care bitsets """
+
+    def __init__(self, bits: int, on: int = 0, dc: int = 0):
+        self.bits = bits
+        self.on = on
+        self.dc = dc & ~on  # A minterm is either required or a don't care
+
+    @classmethod
+    def from_indices(cls, bits: int, on_set, dc_set=()):
+        """ Build a truth table from lists of required and don't care minterm numbers """
+        return cls(bits, indices_to_bitset(on_set, bits), indices_to_bitset(dc_set, bits))
+
+    def full(self) -> int:
+        """ Bitset with every minterm set """
+        return (1 << (1 << self.bits)) - 1
+
+    def care(self) -> int:
+        """ Bitset of minterms that may be covered (required or don't care) """
+        return self.on | self.dc
+
+    def complement(self):
+        """ Truth table of the inverted function: the zeros become required, don't cares stay """
+        return TruthTable(self.bits, self.full() & ~self.care(), self.dc)
+
+    def minterms(self) -> list[int]:
+        """ Required minterm numbers """
+        return bitset_to_indices(self.on)
+
+    def dont_cares(self) -> list[int]:
+        """ Don't care minterm numbers """
+        return bitset_to_indices(self.dc)
+
+    def get(self, index: int) -> str:
+        """ Cell value as '1', 'X' or '0' """
+        if (self.on >> index) & 1:
+            return '1'
+        if (self.dc >> index) & 1:
+            return 'X'
+        return '0'
+
+def get_prime_implicant_pairs(implicants, bits: int, stats: dict = None) -> list[tuple[int, int]]:
+    """
+    Finds all prime implicants using Quine-McCluskey tabulation on (value, mask) pairs.
+    Implicants are grouped by mask and number of ones, so a term is only compared with
+    the group that has the same mask and exactly one more one.
+
+    Args:
+        implicants: Iterable of (value, mask) pairs
+        bits: Number of variables
+        stats: Dictionary to add a 'qm_passes' list to, with the terms, comparisons
+            and merges of every pass (None to skip counting)
+    Returns:
+        List of prime implicants as (value, mask) pairs
+    """
+    full = (1 << bits) - 1
+    prime_implicants = set()
+    current = set(implicants)
+
+    while current:
+        # Group terms by (mask, number of ones)
+        groups = {}
+        for value, mask in current:
+            groups.setdefault((mask, value.bit_count()), set()).add(value)
+
+        merged = set()
+        next_level = set()
+        for (mask, ones), group in groups.items():
+            upper = groups.get((mask, ones + 1))
+            if not upper:
+                continue
+            for value in group:
+                # Try setting each free zero bit; the result must be in the next group
+                free = full & ~(value | mask)
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    if value | bit in upper:
+                        next_level.add((value, mask | bit))
+                        merged.add((value, mask))
+                        merged.add((value | bit, mask))
+
+        # Anything that could not be merged is prime
+        prime_implicants.update(current - merged)
+        if stats is not None:
+            stats.setdefault('qm_passes', []).append(count_merge_pass(groups, next_level, full))
+        current = next_level
+
+    return sorted(prime_implicants, key=lambda implicant: (implicant[1], implicant[0]))
+
+def count_merge_pass(groups: dict, next_level: set, full: int) -> dict:
+    """
+    Recounts the work of one tabulation pass, so the pass itself stays uninstrumented.
+
+    Args:
+        groups: The pass's terms grouped by (mask, number of ones)
+        next_level: The merged terms the pass produced
+        full: Bitmask of all variables
+    Returns:
+        Dictionary with the 'terms', 'comparisons' (lookups in a neighbouring group)
+        and 'merges' (pairs that combined) of the pass
+    """
+    terms = 0
+    comparisons = 0
+    for (mask, ones), group in groups.items():
+        terms += len(group)
+        if (mask, ones + 1) in groups:
+            for value in group:
+                comparisons += (full & ~(value | mask)).bit_count()
+
+    # A merged term came from every dash whose two halves were both terms of the pass
+    merges = 0
+    for value, mask in next_level:
+        dashes = mask
+        while dashes:
+            bit = dashes & -dashes
+            dashes ^= bit
+            half = groups.get((mask & ~bit, value.bit_count()))
+            if half and value in half and value | bit in groups.get((mask & ~bit, value.bit_count() + 1), ()):
+                merges += 1
+
+    return {'terms': terms, 'comparisons': comparisons, 'merges': merges}
+
+def get_prime_implicant_pairs_dense(table: TruthTable) -> list[tuple[int, int]]:
+    """
+    Finds all prime implicants of a dense function with NumPy.
+    Every cube is an index into a (3,)*bits array where digit 2 is a dash. A cube is
+    an implicant when both of its halves along some dash axis are, which is filled in
+    one axis at a time with vectorized ANDs. An implicant is prime when no single
+    literal can be turned into a dash. Cost is 3^bits no matter how many terms merge.
+
     Args:
-        minterm1: First minterm string (e.g., '1001')
-        minterm2: Second minterm string (e.g., '1011')
+        table: Truth table of the function (required and don't care minterms may be covered)
     Returns:
-        True if minterms differ in exactly one position, False otherwise (e.g., True for '1001' and '1011')
+        List of prime implicants as (value, mask) pairs, in the same order as get_prime_implicant_pairs
     """
+    if np is None:
+        raise ImportError("NumPy is required for the dense prime implicant engine")
+
+    bits = table.bits
+    size = 1 << bits
+    data = np.frombuffer(table.care().to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    cells = np.unpackbits(data, bitorder='little')[:size].astype(bool)
+
+    # Axis 0 is variable A, the most significant bit of the minterm
+    implicant = cells.reshape((2,) * bits)
+    for axis in range(bits):
+        zero = np.take(implicant, 0, axis=axis)
+        one = np.take(implicant, 1, axis=axis)
+        implicant = np.stack([zero, one, zero & one], axis=axis)
+
+    # Clear every implicant that stays an implicant with one more dash
+    prime = implicant.copy()
+    for axis in range(bits):
+        expandable = np.expand_dims(np.take(implicant, 2, axis=axis), axis)
+        literals = [slice(None)] * bits
+        literals[axis] = slice(0, 2)
+        prime[tuple(literals)] &= ~expandable
 
-    # Convert '-' -> '0'
-    m1 = int(''.join('0' if c == '-' else c for c in minterm1), 2)
-    m2 = int(''.join('0' if c == '-' else c for c in minterm2), 2)
+    # Decode base 3 indices into (value, mask)
+    indices = np.nonzero(prime.ravel())[0].astype(np.int64)
+    values = np.zeros(len(indices), dtype=np.int64)
+    masks = np.zeros(len(indices), dtype=np.int64)
+    for axis in range(bits):
+        digits = (indices // 3 ** (bits - 1 - axis)) % 3
+        values = (values << 1) | (digits == 1)
+        masks = (masks << 1) | (digits == 2)
 
-    # Ensure minterms differ in exactly one position
-    res = m1 ^ m2
-    return res != 0 and (res & (res - 1)) == 0
+    return sorted(zip(values.tolist(), masks.tolist()), key=lambda implicant: (implicant[1], implicant[0]))
+
+def use_dense_engine(table: TruthTable, engine: str) -> bool:
+    """
+    Decides whether prime implicants should come from the NumPy engine.
+
+    Args:
+        table: Truth table of the function
+        engine: 'python', 'numpy', 'bdd' or 'auto' (numpy for dense functions when it is installed)
+    Returns:
+        True to use get_prime_implicant_pairs_dense
+    """
+    if engine not in ['auto', 'python', 'numpy', 'bdd']:
+        raise ValueError("Invalid engine. Must be 'auto', 'python', 'numpy' or 'bdd'")
+    if engine != 'auto':
+        return engine == 'numpy'
+    if np is None or table.bits > DENSE_ENGINE_MAX_BITS or table.bits < 6:
+        return False
+    return table.care().bit_count() >= DENSE_ENGINE_MIN_DENSITY * (1 << table.bits)
 
 def get_prime_implicants(minterms: list[str]) -> list[str]:
     """
@@ -74,477 +318,2384 @@ def get_prime_implicants(minterms: list[str]) -> list[str]:
     Returns:
         List of prime implicant strings
     """
+    if not minterms:
+        return []
 
-    # Initialize vars
-    prime_implicants = []
-    merges = [False for _ in minterms]
-    number_of_merges = 0
-    merged_minterm = ""
-    minterm1 = ""
-    minterm2 = ""
-
-    # For each minterm, check if it can be merged with another
-    for i in range(len(minterms)):
-        for c in range(i+1, len(minterms)):
-            minterm1 = minterms[i]
-            minterm2 = minterms[c]
-            
-            if check_dashes_align(minterm1, minterm2) and check_minterm_differences(minterm1, minterm2):
-                # Dashes align and minterms differ in exactly one position!
-                merged_minterm = merge_minterms(minterm1, minterm2)
-
-                # Add to list of prime implicants if it's not already there
-                if merged_minterm not in prime_implicants:
-                    prime_implicants.append(merged_minterm)
-                number_of_merges+=1
-                merges[i] = True
-                merges[c] = True
-    
-    # Add any unmerged minterms to the list of prime implicants
-    for j in range(len(minterms)):
-        if not merges[j] and minterms[j] not in prime_implicants:
-            prime_implicants.append(minterms[j])
-    
-    # If we can furhter merge minterms, recurse
-    if number_of_merges > 0:
-        return get_prime_implicants(prime_implicants)
-    else:
-        return prime_implicants
+    bits = len(minterms[0])
+    implicants = [minterm_to_implicant(minterm) for minterm in minterms]
+    return [implicant_to_minterm(implicant, bits) for implicant in get_prime_implicant_pairs(implicants, bits)]
+
+def get_implicant_coverage(implicants: list[tuple[int, int]], minterms: list[int]) -> list[int]:
+    """
+    Finds which minterms each implicant covers, as one column bitmask per implicant.
+    An implicant (value, mask) covers minterm t when t & ~mask == value. Small cubes
+    look up their own minterms instead of testing every column.
 
-def create_prime_implicant_chart(prime_implicants: list[str], minterms: list[str]) -> dict[str, list[str]]:
+    Args:
+        implicants: List of (value, mask) pairs
+        minterms: List of minterm integers (column j is minterms[j])
+    Returns:
+        List of bitmasks, bit j set when the implicant covers minterms[j]
+    """
+    columns = {minterm: j for j, minterm in enumerate(minterms)}
+    rows = []
+    for value, mask in implicants:
+        if 1 << mask.bit_count() <= len(minterms):
+            hits = [columns[minterm] for minterm in cube_minterms((value, mask)) if minterm in columns]
+        else:
+            hits = [j for j, minterm in enumerate(minterms) if minterm & ~mask == value]
+        if len(hits) < 64:
+            row = 0
+            for j in hits:
+                row |= 1 << j
+        else:
+            # Set many bits in a buffer so each one is not a shift of the whole row
+            data = bytearray((len(minterms) + 7) // 8)
+            for j in hits:
+                data[j >> 3] |= 1 << (j & 7)
+            row = int.from_bytes(data, 'little')
+        rows.append(row)
+    return rows
+
+def create_prime_implicant_chart(prime_implicants: list[str], minterms: list[str]) -> dict[str, int]:
     """
     Creates a chart showing which minterms are covered by each prime implicant.
-    For each prime implicant, checks if it covers each minterm and creates a boolean array.
+    Each prime implicant maps to a bitmask where bit j means it covers minterms[j].
     
     Args:
         prime_implicants: List of prime implicant strings
         minterms: List of minterm strings
     Returns:
-        Dictionary mapping each prime implicant to its coverage array
+        Dictionary mapping each prime implicant to its coverage bitmask
     """
+    implicants = [minterm_to_implicant(prime_implicant) for prime_implicant in prime_implicants]
+    rows = get_implicant_coverage(implicants, [int(minterm, 2) for minterm in minterms])
+    return dict(zip(prime_implicants, rows))
 
-    prime_implicant_chart = {}
-    
-    # Initialize chart
-    for i in range(len(prime_implicants)):
-        prime_implicant_chart[prime_implicants[i]] = []
-    
-    # For each prime implicant, check if it covers each midterm
-    for i in range(len(list(prime_implicant_chart.keys()))):
-        prime_implicant = list(prime_implicant_chart.keys())[i]
-
-        for j in range(len(minterms)):
-            # Does this prime implicant match this midterm?
-            failed = False
-            for k in range(len(minterms[j])):
-                if prime_implicant[k] == '-':
-                    continue
-                minterm = minterms[j][k]
-                if (minterm != prime_implicant[k]):
-                    failed = True
-                    break
-            
-            # If it does, mark the column as covered
-            if not failed:
-                prime_implicant_chart[prime_implicant].append(True)
-            else:
-                prime_implicant_chart[prime_implicant].append(False)
-
-    return prime_implicant_chart
+def get_column_index(rows: dict[int, int], columns: int) -> dict[int, int]:
+    """
+    Builds a column-major view of a cover problem.
+    Walks the set bits of each row once (with bitset_to_indices) instead of testing
+    every row for every column, so the cost is linear in the chart's set bits.
 
+    Args:
+        rows: Dictionary mapping row index to the bitmask of columns it covers
+        columns: Bitmask of columns to index
+    Returns:
+        Dictionary mapping each column number to the bitmask of rows that cover it
+    """
+    column_index = dict.fromkeys(bitset_to_indices(columns), 0)
+    for row, coverage in rows.items():
+        row_bit = 1 << row
+        for column in bitset_to_indices(coverage & columns):
+            column_index[column] |= row_bit
+    return column_index
 
-def find_valid_combinations(coverage_dict):
+def reduce_cover_problem(rows: dict[int, int], columns: int, row_dominance: bool, costs: list = None):
     """
-    Finds all valid combinations of prime implicants that cover all minterms.
-    Tests combinations of all possible lengths to find those that provide complete coverage.
-   
+    Shrinks a cover problem by selecting essential rows and removing dominated columns.
+    Row dominance can drop rows that appear in some minimum covers, so it should only
+    be enabled when a single minimum cover (or its cost) is needed.
+
     Args:
-        coverage_dict: Dictionary mapping prime implicants to their coverage arrays
+        rows: Dictionary mapping row index to the bitmask of columns it covers
+        columns: Bitmask of columns that still need to be covered
+        row_dominance: Also remove rows whose coverage is a subset of another row
+            that costs no more
+        costs: Cost of each row by index (None when every row costs 1)
     Returns:
-        List of valid combinations (each combination is a list of prime implicants)
+        Tuple of (selected rows, remaining rows, remaining columns),
+        or None if some column cannot be covered
     """
-    def combinations(iterable, r):
-        # Get the length of the iterable
-        n = len(iterable)
-        # Create a list to hold the combinations
-        result = []
-        
-        # Helper function to generate combinations
-        def combo(start, path):
-            if len(path) == r:
-                result.append(path)
-                return
-            for i in range(start, n):
-                combo(i + 1, path + [iterable[i]])
-        
-        combo(0, [])
-        return result
-    
-    # Get all possible implicants
-    implicants = list(coverage_dict.keys())
-    num_columns = len(list(coverage_dict.values())[0])
-    valid_solutions = []
-    
-    # Try combinations of different lengths, from 1 up to total number of implicants
-    for length in range(1, len(implicants) + 1):
-        # Get all possible combinations of current length
-        for combo in combinations(implicants, length):
-            # Check if this combination covers all columns
-            is_valid = True
-            for col in range(num_columns):
-                # Check if any implicant in the combination covers this column
-                column_covered = False
-                for imp in combo:
-                    if coverage_dict[imp][col]:
-                        column_covered = True
-                        break
-                
-                # If no implicant covers this column, combination is invalid
-                if not column_covered:
-                    is_valid = False
+    selected = []
+    rows = {row: coverage & columns for row, coverage in rows.items() if coverage & columns}
+
+    changed = True
+    while changed and columns:
+        changed = False
+        column_index = get_column_index(rows, columns)
+
+        # Every column needs at least one row
+        if not all(column_index.values()):
+            return None
+
+        # A column covered by a single row makes that row essential
+        essentials = set()
+        for covering in column_index.values():
+            if covering & (covering - 1) == 0:
+                essentials.add(covering.bit_length() - 1)
+        if essentials:
+            for row in sorted(essentials):
+                selected.append(row)
+                columns &= ~rows.pop(row)
+            rows = {row: coverage & columns for row, coverage in rows.items() if coverage & columns}
+            changed = True
+            continue
+
+        # If every row covering column a also covers column b, column b comes for free.
+        # The columns covered by all of a's rows are the AND of those rows.
+        removed = set()
+        for column_a, covering_a in sorted(column_index.items(), key=lambda item: item[1].bit_count()):
+            if column_a in removed:
+                continue
+            dominated = columns & ~(1 << column_a)
+            for row in bitset_to_indices(covering_a):
+                dominated &= rows[row]
+                if not dominated:
                     break
-            
-            # If we found a valid combination, add it to solutions
-            if is_valid:
-                valid_solutions.append(list(combo))
-        
-        # If we found valid solutions at this length, we can stop
-        # (as longer combinations would be redundant)
-        if valid_solutions:
-            break
-    
-    return valid_solutions
+            if dominated:
+                columns &= ~dominated
+                removed.update(bitset_to_indices(dominated))
+                changed = True
 
-# minterms = [
-#     {
-#         'binary': "0100",
-#         'required': True,
-#     },
-#     {
-#         'binary': "1000",
-#         'required': True,
-#     },
-#     {
-#         'binary': "1001",
-#         'required': False,
-#     },
-#     {
-#         'binary': "1010",
-#         'required': True,
-#     },
-#     {
-#         'binary': "1100",
-#         'required': True,
-#     },
-#     {
-#         'binary': "1011",
-#         'required': True,
-#     },
-#     {
-#         'binary': "1110",
-#         'required': False,
-#     },
-#     {
-#         'binary': "1111",
-#         'required': True
-#     }
-# ]
+        # A row covering a subset of a row that costs no more is never needed.
+        # The rows covering all of a row's columns are the AND of those columns' rows.
+        if row_dominance:
+            alive = 0
+            for row in rows:
+                alive |= 1 << row
+            for row in sorted(rows, key=lambda r: (rows[r].bit_count(), -r)):
+                coverage = rows[row] & columns
+                dominators = alive & ~(1 << row)
+                for column in bitset_to_indices(coverage):
+                    dominators &= column_index[column]
+                    if not dominators:
+                        break
+                if dominators and costs is not None:
+                    dominators = sum(1 << other for other in bitset_to_indices(dominators) if costs[other] <= costs[row])
+                if dominators:
+                    del rows[row]
+                    alive &= ~(1 << row)
+                    changed = True
 
-def request_kmap_size() -> int:
-    return int(input("Please enter kmap size \n1=2x2\n2=2x4\n3=4x4\n"))
+        if changed:
+            rows = {row: coverage & columns for row, coverage in rows.items() if coverage & columns}
 
-def request_analysis_type() -> int:
-    return int(input("Please enter analysis type \n1=SOP\n2=POS\n"))
+    return selected, rows, columns
 
-def request_input_type() -> int:
-    return int(input("Please enter input type \n1=kmap\n2=binary\n"))
+def cover_lower_bound(column_index: dict[int, int], costs: list = None):
+    """
+    Finds a set of columns that pairwise share no covering row.
+    Each of them needs its own row, so the cheapest row of each adds up to a lower
+    bound on the cost of a cover (its size when every row costs 1).
 
-def request_kmap_input(kmap_size: int) -> list[dict]:
-    minterms = []
-
-    # Define dimensions based on kmap_size
-    if kmap_size == 1:  # 2x2
-        rows, cols = 2, 2
-        bits = 2
-    elif kmap_size == 2:  # 2x4
-        rows, cols = 2, 4
-        bits = 3
-    elif kmap_size == 3:  # 4x4
-        rows, cols = 4, 4
-        bits = 4
-    else:
-        raise ValueError("Invalid kmap size. Must be 1 (2x2), 2 (2x4), or 3 (4x4)")
-    
-    # Generate all binary combinations in Gray code order
-    def gray_code_order(n):
-        if n == 0:
-            return ['']
-        
-        smaller = gray_code_order(n-1)
-        result = []
-        # Reflect and prefix
-        for i in range(len(smaller)):
-            result.append('0' + smaller[i])
-        for i in range(len(smaller)-1, -1, -1):
-            result.append('1' + smaller[i])
-        return result
-    
-    # Generate row and column gray codes
-    row_codes = gray_code_order(bits//2)
-    col_codes = gray_code_order((bits+1)//2)
-    
-    print("Enter values for " + str(rows) + "x" + str(cols) + " K-map\n1=True\n0=False\nX=don't care")
-    
-    # Collect input for each cell
-    for row in row_codes:
-        for col in col_codes:
-            binary = row + col
-            while True:
-                value = input(str(binary) + "= ").upper()
-                if value in ['0', '1', '2', 'X']:
-                    break
-                print("Invalid input. Please enter 0, 1, or X")
-            
-            if value in ['1', '2', 'X']:
-                minterms.append({
-                    'binary': binary,
-                    'required': True if value == '1' else False
-                })
-    
-    return minterms
+    Args:
+        column_index: Dictionary mapping each column number to the bitmask of rows that cover it
+        costs: Cost of each row by index (None when every row costs 1)
+    Returns:
+        Lower bound on the cost of the rows needed
+    """
+    bound = 0
+    used_rows = 0
+    for covering in sorted(column_index.values(), key=lambda c: c.bit_count()):
+        if not covering & used_rows:
+            used_rows |= covering
+            if costs is None:
+                bound += 1
+            else:
+                bound += min(costs[row] for row in bitset_to_indices(covering))
+    return bound
 
-def to_binary_with_bits(number, bits):
-    # Convert to binary and remove the '0b' prefix
-    binary_str = bin(number)[2:]
-    # Pad with zeros on the left to match the specified number of bits
-    padded_binary = '0' * (bits - len(binary_str)) + binary_str
-    # Truncate if the number is too large for the specified bits
-    return padded_binary[-bits:]
+def selection_cost(chosen, costs: list = None):
+    """ Total cost of the chosen rows (their number when every row costs 1) """
+    if costs is None:
+        return len(chosen)
+    return sum(costs[row] for row in chosen)
 
-def request_binary_input(kmap_size: int) -> list[dict]:
-    minterms = []
-
-    # Define dimensions based on kmap_size
-    if kmap_size == 1:  # 2x2
-        size = 4
-        bits = 2
-    elif kmap_size == 2:  # 2x4
-        size = 8
-        bits = 3
-    elif kmap_size == 3:  # 4x4
-        size = 16
-        bits = 4
-    else:
-        raise ValueError("Invalid kmap size. Must be 1 (2x2), 2 (2x4), or 3 (4x4)")
-    
+def search_covers(rows: dict[int, int], columns: int, chosen: list[int], state: dict, row_dominance: bool, collect: bool):
+    """
+    Branch-and-bound search over the rows of a cover problem.
+    Branches on the column with the fewest covering rows. Branch i takes the i-th of
+    those rows and excludes the earlier ones, so no cover is visited twice.
+    Covers are yielded as they are found, and nothing past the last one the caller
+    takes is searched.
 
-    # Request all binary combs in norm order
-    for i in range(size):
-        binary = to_binary_with_bits(i, bits)
-        while True:
-            value = input(str(binary) + "= ").upper()
-            if value in ['0', '1', '2', 'X']:
-                break
-            print("Invalid input. Please enter 0, 1, or X")
-        
-        if value in ['1', '2', 'X']:
-            minterms.append({
-                'binary': binary,
-                'required': True if value == '1' else False
-            })
-    return minterms
+    Args:
+        rows: Dictionary mapping row index to the bitmask of columns it covers
+        columns: Bitmask of columns that still need to be covered
+        chosen: Rows already in the partial cover
+        state: Dictionary holding the current cost 'bound', the row 'costs' (None when
+            every row costs 1) and the number of nodes 'explored' and 'pruned'
+        row_dominance: Passed to reduce_cover_problem
+        collect: Yield every cover costing 'bound' instead of each cover that lowers it
+    Yields:
+        Sorted lists of row indices
+    """
+    costs = state['costs']
+    state['explored'] += 1
+    reduced = reduce_cover_problem(rows, columns, row_dominance, costs)
+    if reduced is None:
+        state['pruned'] += 1
+        return
+    selected, rows, columns = reduced
+    chosen = chosen + selected
+    cost = selection_cost(chosen, costs)
 
+    # Costs summed in a different order can differ by rounding, so the bound is compared with a tolerance
+    if not columns:
+        if collect and math.isclose(cost, state['bound']):
+            yield sorted(chosen)
+        elif not collect and cost < state['bound'] and not math.isclose(cost, state['bound']):
+            state['bound'] = cost
+            yield sorted(chosen)
+        return
 
-def print_kmap(minterms: list[dict]) -> None:
-    # Determine kmap size based on binary length
-    binary_length = len(minterms[0]['binary'])
-    
-    if binary_length == 2:
-        rows, cols = 2, 2
-        kmap = [[' ' for _ in range(2)] for _ in range(2)]
-        col_header = ['0', '1']
-        row_header = ['0', '1']
-    elif binary_length == 3:
-        rows, cols = 2, 4
-        kmap = [[' ' for _ in range(4)] for _ in range(2)]
-        col_header = ['00', '01', '11', '10']
-        row_header = ['0', '1']
-    elif binary_length == 4:
-        rows, cols = 4, 4
-        kmap = [[' ' for _ in range(4)] for _ in range(4)]
-        col_header = ['00', '01', '11', '10']
-        row_header = ['00', '01', '11', '10']
+    column_index = get_column_index(rows, columns)
+    lower_bound = cost + cover_lower_bound(column_index, costs)
+    at_bound = math.isclose(lower_bound, state['bound'])
+    if (lower_bound > state['bound'] and not at_bound) or (at_bound and not collect):
+        state['pruned'] += 1
+        return
+
+    # Branch on the hardest column, trying the widest (or cheapest per column) rows first
+    covering = min(column_index.values(), key=lambda c: c.bit_count())
+    candidates = [row for row in rows if covering >> row & 1]
+    if costs is None:
+        candidates.sort(key=lambda row: -rows[row].bit_count())
     else:
-        raise ValueError("Invalid minterm binary length")
-    
-    # Fill the K-map
-    for term in minterms:
-        binary = term['binary']
-        if binary_length == 2:
-            row = int(binary[0])
-            col = int(binary[1])
-        elif binary_length == 3:
-            row = int(binary[0])
-            col_bits = binary[1:]
-            col = col_header.index(col_bits)
-        else:  # binary_length == 4
-            row_bits = binary[0:2]
-            col_bits = binary[2:]
-            row = row_header.index(row_bits)
-            col = col_header.index(col_bits)
-        
-        # Set the value based on required field
-        if term['required'] == False:
-            kmap[row][col] = 'X'
-        elif term['required']:
-            kmap[row][col] = '1'
-        else:
-            kmap[row][col] = '0'
-    
-    # Fill remaining empty spaces with '0'
-    for i in range(rows):
-        for j in range(cols):
-            if kmap[i][j] == ' ':
-                kmap[i][j] = '0'
-    
-    # Print the K-map
-    # Print column headers
-    print('   ', end='')
-    for header in col_header:
-        print('  ' + header, end='')
-    print()
-    
-    # Print rows with headers
-    for i in range(rows):
-        print(' ' + row_header[i] + ' ', end='')
-        for j in range(cols):
-            print('  ' + kmap[i][j] + ' ', end='')
-        print()
+        candidates.sort(key=lambda row: costs[row] / rows[row].bit_count())
 
-def format(value, fmt_spec):
-    if fmt_spec.startswith('0') and 'b' in fmt_spec:
-        zero_padding = int(fmt_spec[1:fmt_spec.index('b')])
-        # Manual binary conversion with zero padding
-        binary_str = bin(value)[2:]  # Convert to binary and remove '0b'
-        return '0' * (zero_padding - len(binary_str)) + binary_str
-    return str(value)
-
-def transform_minterms(minterms: list[dict]) -> list[dict]:
-    # First, get the length of binary strings to determine total possible combinations
-    binary_length = len(minterms[0]['binary'])
-    
-    # Create a set of all possible binary combinations
-    all_binary = {format(i, '0' + str(binary_length) + 'b') for i in range(2 ** binary_length)}
-    
-    # Create sets for existing binaries
-    existing_binaries = {term['binary'] for term in minterms}
-    # false_binaries = {term['binary'] for term in minterms if term['required'] is False}
-    
-    # Find missing binaries (ones not in the original input)
-    missing_binaries = all_binary - existing_binaries
-    
-    # Create new minterms list starting with the False required terms
-    new_minterms = [term for term in minterms if term['required'] is False]
-    
-    # Add missing binaries as True required terms
-    for binary in missing_binaries:
-        new_minterms.append({
-            'binary': binary,
-            'required': True
-        })
-    
-    # Sort by binary value to maintain order
-    new_minterms.sort(key=lambda x: x['binary'])
-    
-    return new_minterms
+    remaining = dict(rows)
+    for row in candidates:
+        coverage = remaining.pop(row)
+        yield from search_covers(remaining, columns & ~coverage, chosen + [row], state, row_dominance, collect)
 
-def flip_binary_strings(arr: list[str]) -> list[str]:
-    flipped = []
-    for s in arr:
-        # Create new string by replacing each character
-        new_s = ''.join('1' if c == '0' else '0' if c == '1' else c for c in s)
-        flipped.append(new_s)
-    return flipped
+def record_search(state: dict, stats: dict) -> None:
+    """ Adds the node counts of a finished cover search to a stats dictionary """
+    if stats is not None:
+        stats['cover_explored'] = stats.get('cover_explored', 0) + state['explored']
+        stats['cover_pruned'] = stats.get('cover_pruned', 0) + state['pruned']
 
-def binary_groups_to_POS_expression(groups: list[str]) -> str:
-    def term_to_expression(term: str) -> str:
-        expression_parts = []
-        variables = ['A', 'B', 'C', 'D']
-        
-        for i, bit in enumerate(term):
-            if bit == '1':
-                expression_parts.append(variables[i])
-            elif bit == '0':
-                expression_parts.append(str(variables[i]) + "'")
-            # Skip '-' bits
-        
-        return '+'.join(expression_parts)
-    
-    # Convert each group to expression and wrap in parentheses
-    group_expressions = ["(" + str(term_to_expression(group)) + ")" for group in groups]
-    return ''.join(group_expressions)
+def split_cover_problem(rows: dict[int, int], columns: int) -> list[tuple[dict[int, int], int]]:
+    """
+    Splits a cover problem into independent blocks. Two columns are in the same block
+    when some chain of rows links them, so a block's cover never depends on the others.
 
-def binary_groups_to_SOP_simplified_expression(groups: list[str]) -> str:
-    def term_to_expression(term: str) -> str:
-        expression_parts = []
-        variables = ['A', 'B', 'C', 'D']
-        
-        for i, bit in enumerate(term):
-            if bit == '1':
-                expression_parts.append(variables[i])
-            elif bit == '0':
-                expression_parts.append(str(variables[i]) + "'")
-            # Skip '-' bits
-        
-        # Join without '+' to make product terms
-        return ''.join(expression_parts)
+    Args:
+        rows: Dictionary mapping row index to the bitmask of columns it covers
+        columns: Bitmask of columns that need to be covered
+    Returns:
+        List of (rows, columns) blocks, largest first
+    """
+    column_index = get_column_index(rows, columns)
+    row_columns = {row: bitset_to_indices(coverage & columns) for row, coverage in rows.items()}
+    components = []
+    seen = set()
+    for start in column_index:
+        if start in seen:
+            continue
+        seen.add(start)
+        component_rows = 0
+        component_columns = 1 << start
+        frontier = [start]
+        while frontier:
+            new_rows = column_index[frontier.pop()] & ~component_rows
+            component_rows |= new_rows
+            for row in bitset_to_indices(new_rows):
+                component_columns |= rows[row]
+                for column in row_columns[row]:
+                    if column not in seen:
+                        seen.add(column)
+                        frontier.append(column)
+        components.append(({row: rows[row] for row in bitset_to_indices(component_rows)}, component_columns & columns))
+    components.sort(key=lambda component: -len(component[0]))
+    return components
 
-    # Convert each group to expression
-    group_expressions = [term_to_expression(group) for group in groups]
-    
-    # Join with '+' to create sum of products
-    return '+'.join(group_expressions)
+def iter_component_covers(rows: dict[int, int], columns: int, state: dict):
+    """
+    Finds the minimum cost of a cover problem with full dominance reductions, then
+    yields every cover of that cost with the bound already tight.
 
-kmap_size = request_kmap_size()
-analysis_type = request_analysis_type()
-input_type = request_input_type()
-if input_type == 1:
-    minterms = request_kmap_input(kmap_size)
-else:
-    minterms = request_binary_input(kmap_size)
-# print(minterms)
-print("Inputted KMAP!")
-print_kmap(minterms)
-input()
-
-if analysis_type == 2:
-    # add missing minterms for non existing binaries atm. Delete old ones where required is true
-    minterms = transform_minterms(minterms)
-    # print(minterms)
-    print("Flipped KMAP!")
-    print_kmap(minterms)
-    input()
-    # pass
+    Args:
+        rows: Dictionary mapping row index to the bitmask of columns it covers
+        columns: Bitmask of columns that need to be covered
+        state: Search state for search_covers (its 'bound' is reset here)
+    Yields:
+        Minimum covers (each a sorted list of row indices), in search order
+    """
+    total = selection_cost(rows, state['costs'])
+    state['bound'] = total + 1
+    for _ in search_covers(rows, columns, [], state, True, False):
+        pass
+    if state['bound'] > total:
+        return
+    yield from search_covers(rows, columns, [], state, False, True)
+
+def solve_cover_component(rows: dict[int, int], columns: int, costs: list, collect: bool,
+                          initial: list[int] = None) -> tuple:
+    """
+    Solves one block of a split cover problem (run in a worker when parallel).
 
-all_implicants = [q['binary'] for q in minterms]
-pm_implicants = [q['binary'] for q in minterms if q['required']]
+    Args:
+        rows: Dictionary mapping row index to the bitmask of columns it covers
+        columns: Bitmask of columns that need to be covered
+        costs: Cost of each row by index (None when every row costs 1)
+        collect: Find every minimum cover instead of one
+        initial: A known cover of the whole chart; when its rows in this block
+            cover the block, their cost is the starting bound (one cover only)
+    Returns:
+        Tuple of (minimum covers, nodes explored, nodes pruned)
+    """
+    state = {'bound': selection_cost(rows, costs) + 1, 'costs': costs, 'explored': 0, 'pruned': 0}
+    if collect:
+        covers = list(iter_component_covers(rows, columns, state))
+    else:
+        covers = []
+        if initial is not None:
+            known = [row for row in initial if row in rows]
+            covered = 0
+            for row in known:
+                covered |= rows[row]
+            if not columns & ~covered:
+                state['bound'] = selection_cost(known, costs)
+                covers = [sorted(known)]
+        # Each cover found is cheaper than the one before
+        for cover in search_covers(rows, columns, [], state, True, False):
+            covers = [cover]
+    return covers, state['explored'], state['pruned']
 
-# print(pm_implicants)
+def solve_cover_components(components: list[tuple[dict[int, int], int]], costs: list, collect: bool,
+                           executor: concurrent.futures.Executor = None,
+                           initial: list[int] = None) -> tuple[list[list[list[int]]], int, int]:
+    """
+    Solves blocks of a split cover problem, sending the large ones to an executor.
 
-prime_implicants = get_prime_implicants(all_implicants)
-# print(prime_implicants)
-pi_chart = create_prime_implicant_chart(prime_implicants, pm_implicants)
-# print(pi_chart)
-results = find_valid_combinations(pi_chart)
+    Args:
+        components: (rows, columns) blocks from split_cover_problem
+        costs: Cost of each row by index (None when every row costs 1)
+        collect: Find every minimum cover of each block instead of one
+        executor: Executor to solve blocks of at least PARALLEL_COMPONENT_MIN_ROWS
+            rows in (None to solve every block here)
+        initial: A known cover of the whole chart to bound each block's search with
+            (see solve_cover_component)
+    Returns:
+        Tuple of the minimum covers of each block, nodes explored and nodes pruned
+    """
+    results = [None] * len(components)
+    futures = {}
+    for i, (rows, columns) in enumerate(components):
+        if executor is not None and len(components) > 1 and len(rows) >= PARALLEL_COMPONENT_MIN_ROWS:
+            futures[i] = executor.submit(solve_cover_component, rows, columns, costs, collect, initial)
+        else:
+            results[i] = solve_cover_component(rows, columns, costs, collect, initial)
+    for i, future in futures.items():
+        results[i] = future.result()
 
-# print("RES")
-for result in results:
-    if analysis_type == 2:
-        result = flip_binary_strings(result)
-        result = binary_groups_to_POS_expression(result)
-        # print(result)
-    else:
-        result = binary_groups_to_SOP_simplified_expression(result)
-        # print(result)
+    covers = [component_covers for component_covers, _, _ in results]
+    return covers, sum(explored for _, explored, _ in results), sum(pruned for _, _, pruned in results)
+
+def lazy_product(iterables: list):
+    """
+    Cartesian product in the order of itertools.product, which reads every iterable
+    up front. Here each item is only pulled from its iterable when the first
+    combination holding it is produced. The first iterable is streamed; only the
+    items of the others are kept for the combinations after that.
+
+    Args:
+        iterables: Iterables to combine (the first one varies slowest)
+    Yields:
+        Tuples with one item of each iterable
+    """
+    iterators = [iter(iterable) for iterable in iterables[1:]]
+    seen = [[] for _ in iterators]
+
+    def items(k: int):
+        i = 0
+        while True:
+            if i == len(seen[k]):
+                item = next(iterators[k], seen)
+                if item is seen:
+                    return
+                seen[k].append(item)
+            yield seen[k][i]
+            i += 1
+
+    def combinations(k: int):
+        if k == len(iterables):
+            yield ()
+            return
+        for item in iterables[0] if k == 0 else items(k - 1):
+            for rest in combinations(k + 1):
+                yield (item,) + rest
+
+    return combinations(0)
+
+def iter_minimum_covers(rows: list[int], universe: int, stats: dict = None, costs: list = None,
+                        executor: concurrent.futures.Executor = None):
+    """
+    Yields every minimum-cost set of rows whose coverage includes the whole universe.
+    After the essential rows are taken, the chart is split into independent blocks
+    (see split_cover_problem), so the search costs the sum of the blocks rather than
+    their product; every minimum cover is one minimum cover of each block. Each block
+    is searched lazily: its minimum cost is found first, then its covers are
+    enumerated with the bound already tight as combinations need them (see
+    lazy_product), so stopping early skips the rest of every block.
+
+    Args:
+        rows: List of column bitmasks, one per row
+        universe: Bitmask of columns that must be covered
+        stats: Dictionary to add the searched and pruned node counts and the number
+            of 'cover_components' to (None to skip)
+        costs: Cost of each row (None to minimize the number of rows)
+        executor: Executor to solve every block but the largest in up front, in
+            parallel (None to search them lazily here). Only worth it when every
+            cover is wanted
+    Yields:
+        Minimum covers (each a sorted list of row indices), in search order
+    """
+    row_dict = {row: coverage for row, coverage in zip(range(len(rows)), rows)}
+    state = {'bound': 0, 'costs': costs, 'explored': 0, 'pruned': 0}
+    states = [state]
+    try:
+        reduced = reduce_cover_problem(row_dict, universe, False, costs)
+        if reduced is None:
+            return
+        selected, row_dict, columns = reduced
+        components = split_cover_problem(row_dict, columns)
+        if stats is not None:
+            stats['cover_components'] = stats.get('cover_components', 0) + len(components)
+        if not components:
+            yield sorted(selected)
+            return
+
+        if executor is not None:
+            others, state['explored'], state['pruned'] = solve_cover_components(components[1:], costs, True, executor)
+        else:
+            states += [{'bound': 0, 'costs': costs, 'explored': 0, 'pruned': 0} for _ in components[1:]]
+            others = [iter_component_covers(*component, block_state)
+                      for component, block_state in zip(components[1:], states[1:])]
+        for combination in lazy_product([iter_component_covers(*components[0], state)] + others):
+            yield sorted(selected + [row for part in combination for row in part])
+    finally:
+        for block_state in states:
+            record_search(block_state, stats)
+
+def find_minimum_covers(rows: list[int], universe: int, stats: dict = None, limit: int = None,
+                        costs: list = None, executor: concurrent.futures.Executor = None) -> list[list[int]]:
+    """
+    Finds every minimum-cost set of rows whose coverage includes the whole universe.
+
+    Args:
+        rows: List of column bitmasks, one per row
+        universe: Bitmask of columns that must be covered
+        stats: Dictionary to add the searched and pruned node counts to (None to skip)
+        limit: Stop after this many covers (None for all of them)
+        costs: Cost of each row (None to minimize the number of rows)
+        executor: Executor to solve independent blocks of the chart in (None for none);
+            only used without a limit, since with one the blocks are searched lazily
+    Returns:
+        Sorted list of minimum covers (each a sorted list of row indices)
+    """
+    if limit is not None:
+        executor = None
+    return sorted(itertools.islice(iter_minimum_covers(rows, universe, stats, costs, executor), limit))
+
+def find_minimum_cover(rows: list[int], universe: int, initial: list[int] = None, stats: dict = None,
+                       costs: list = None, executor: concurrent.futures.Executor = None):
+    """
+    Finds one minimum-cost set of rows whose coverage includes the whole universe.
+    Cheaper than find_minimum_covers since the enumeration pass is skipped. The chart
+    is split into independent blocks like iter_minimum_covers.
+
+    Args:
+        rows: List of column bitmasks, one per row
+        universe: Bitmask of columns that must be covered
+        initial: A known cover (list of row indices); in each block whose columns
+            its rows still cover, their cost is the starting bound and the search
+            only looks for strictly cheaper covers
+        stats: Dictionary to add the searched and pruned node counts to (None to skip)
+        costs: Cost of each row (None to minimize the number of rows)
+        executor: Executor to solve independent blocks of the chart in (None for none)
+    Returns:
+        Sorted list of row indices, or None if the universe cannot be covered
+    """
+    row_dict = {row: coverage for row, coverage in zip(range(len(rows)), rows)}
+    state = {'bound': 0, 'costs': costs, 'explored': 0, 'pruned': 0}
+    reduced = reduce_cover_problem(row_dict, universe, True, costs)
+    if reduced is None:
+        return None
+    selected, row_dict, columns = reduced
+    components = split_cover_problem(row_dict, columns)
+    covers, state['explored'], state['pruned'] = solve_cover_components(components, costs, False, executor, initial)
+    record_search(state, stats)
+    if stats is not None:
+        stats['cover_components'] = stats.get('cover_components', 0) + len(components)
+    if not all(covers):
+        return None
+    return sorted(selected + [row for component_covers in covers for row in component_covers[0]])
+
+def literal_cost(group: str) -> int:
+    """ Number of literals (gate inputs) in a binary group string """
+    return len(group) - group.count('-')
+
+def get_cost_function(cost):
+    """
+    Resolves a cover cost option.
+
+    Args:
+        cost: None (count product terms), 'literals' or a function from a binary
+            group string to its cost
+    Returns:
+        Cost function, or None to count product terms
+    """
+    if cost is None or callable(cost):
+        return cost
+    if cost == 'literals':
+        return literal_cost
+    raise ValueError("Invalid cost. Must be 'literals' or a function")
+
+def iter_valid_combinations(coverage_dict, num_columns: int = None, cost=None,
+                            executor: concurrent.futures.Executor = None):
+    """
+    Yields the valid combinations of prime implicants that cover all minterms one at a
+    time. Only combinations of the smallest possible size (or cost) are produced.
+
+    Args:
+        coverage_dict: Dictionary mapping prime implicants to their coverage bitmasks
+            (boolean coverage arrays are also accepted)
+        num_columns: Number of minterms in the chart (defaults to every covered minterm)
+        cost: None to minimize the number of implicants, 'literals' or a function
+            giving each implicant's cost to minimize their total cost instead
+        executor: Executor to solve independent blocks of the chart in up front
+            (see iter_minimum_covers; None to search them lazily)
+    Yields:
+        Valid combinations (each combination is a list of prime implicants)
+    """
+    implicants = list(coverage_dict.keys())
+    rows = []
+    for coverage in coverage_dict.values():
+        if isinstance(coverage, list):
+            num_columns = len(coverage)
+            coverage = sum(1 << col for col in range(len(coverage)) if coverage[col])
+        rows.append(coverage)
+
+    if num_columns is None:
+        universe = 0
+        for row in rows:
+            universe |= row
+    else:
+        # A minterm no prime implicant covers makes the chart unsolvable
+        universe = (1 << num_columns) - 1
+        if not all(get_column_index(dict(enumerate(rows)), universe).values()):
+            return
+
+    cost = get_cost_function(cost)
+    costs = None if cost is None else [cost(implicant) for implicant in implicants]
+    for cover in iter_minimum_covers(rows, universe, costs=costs, executor=executor):
+        yield [implicants[i] for i in cover]
+
+def find_valid_combinations(coverage_dict, num_columns: int = None, limit: int = None, first_only: bool = False,
+                            cost=None, executor: concurrent.futures.Executor = None):
+    """
+    Finds all valid combinations of prime implicants that cover all minterms.
+    Only combinations of the smallest possible size (or cost) are returned.
+   
+    Args:
+        coverage_dict: Dictionary mapping prime implicants to their coverage bitmasks
+            (boolean coverage arrays are also accepted)
+        num_columns: Number of minterms in the chart (defaults to every covered minterm)
+        limit: Stop after this many combinations (None for all of them)
+        first_only: Same as limit=1
+        cost: None, 'literals' or an implicant cost function (see iter_valid_combinations)
+        executor: Executor to solve independent blocks of the chart in parallel
+            (None for none); only used without a limit
+    Returns:
+        List of valid combinations (each combination is a list of prime implicants)
+    """
+    if first_only:
+        limit = 1
+    if limit is not None:
+        executor = None
+    implicants = list(coverage_dict.keys())
+    index = {implicant: i for i, implicant in enumerate(implicants)}
+    combinations = itertools.islice(iter_valid_combinations(coverage_dict, num_columns, cost, executor), limit)
+    return sorted(combinations, key=lambda combination: [index[implicant] for implicant in combination])
+
+def cube_minterms(implicant: tuple[int, int]):
+    """
+    Yields every minterm inside a (value, mask) cube.
+
+    Args:
+        implicant: Tuple of value and mask
+    Returns:
+        Generator of minterm integers
+    """
+    value, mask = implicant
+    sub = mask
+    while True:
+        yield value | sub
+        if sub == 0:
+            return
+        sub = (sub - 1) & mask
+
+def cube_in_set(implicant: tuple[int, int], minterms: set[int]) -> bool:
+    """
+    Checks if every minterm of a cube is in a set of minterms.
+
+    Args:
+        implicant: Tuple of value and mask
+        minterms: Set of minterm integers
+    Returns:
+        True if the cube lies inside the set, False otherwise
+    """
+    for minterm in cube_minterms(implicant):
+        if minterm not in minterms:
+            return False
+    return True
+
+def espresso_expand(cover: list[tuple[int, int]], on_set: set[int], care: set[int], bits: int) -> list[tuple[int, int]]:
+    """
+    Expands every cube of a cover into a prime implicant.
+    Each step raises the literal whose opposite face holds the most on-set minterms
+    that are not covered yet. Cubes already covered by expanded cubes are dropped.
+
+    Args:
+        cover: List of (value, mask) cubes
+        on_set: Set of required minterms
+        care: Set of minterms that may be covered (on-set plus don't cares)
+        bits: Number of variables
+    Returns:
+        List of prime (value, mask) cubes
+    """
+    full = (1 << bits) - 1
+    expanded = []
+    covered = set()
+
+    # Big cubes first so they swallow the small ones
+    for value, mask in sorted(cover, key=lambda cube: -cube[1].bit_count()):
+        if cube_in_set((value, mask), covered):
+            continue
+
+        while True:
+            best_bit = 0
+            best_score = -1
+            free = full & ~mask
+            while free:
+                bit = free & -free
+                free ^= bit
+                face = ((value ^ bit) & ~mask, mask)
+                if not cube_in_set(face, care):
+                    continue
+                score = 0
+                for minterm in cube_minterms(face):
+                    if minterm in on_set and minterm not in covered:
+                        score += 1
+                if score > best_score:
+                    best_bit = bit
+                    best_score = score
+            if not best_bit:
+                break
+            value &= ~best_bit
+            mask |= best_bit
+
+        expanded.append((value, mask))
+        covered.update(cube_minterms((value, mask)))
+
+    return expanded
+
+def espresso_irredundant(cover: list[tuple[int, int]], on_set: set[int]) -> list[tuple[int, int]]:
+    """
+    Removes cubes whose required minterms are all covered by other cubes.
+    Smaller cubes are tried first.
+
+    Args:
+        cover: List of (value, mask) cubes
+        on_set: Set of required minterms
+    Returns:
+        Irredundant list of cubes
+    """
+    counts = {}
+    for cube in cover:
+        for minterm in cube_minterms(cube):
+            if minterm in on_set:
+                counts[minterm] = counts.get(minterm, 0) + 1
+
+    kept = set(cover)
+    for cube in sorted(cover, key=lambda cube: cube[1].bit_count()):
+        required = [minterm for minterm in cube_minterms(cube) if minterm in on_set]
+        if all(counts[minterm] > 1 for minterm in required):
+            kept.discard(cube)
+            for minterm in required:
+                counts[minterm] -= 1
+
+    return [cube for cube in cover if cube in kept]
+
+def espresso_reduce(cover: list[tuple[int, int]], on_set: set[int]) -> list[tuple[int, int]]:
+    """
+    Shrinks each cube to the smallest cube holding the required minterms only it covers.
+    This gives the next expand pass room to find a different set of primes.
+
+    Args:
+        cover: List of (value, mask) cubes
+        on_set: Set of required minterms
+    Returns:
+        List of reduced cubes
+    """
+    counts = {}
+    for cube in cover:
+        for minterm in cube_minterms(cube):
+            if minterm in on_set:
+                counts[minterm] = counts.get(minterm, 0) + 1
+
+    reduced = []
+    for cube in sorted(cover, key=lambda cube: -cube[1].bit_count()):
+        unique = [minterm for minterm in cube_minterms(cube) if minterm in on_set and counts[minterm] == 1]
+        for minterm in cube_minterms(cube):
+            if minterm in on_set:
+                counts[minterm] -= 1
+        if not unique:
+            continue
+
+        # Supercube of the unique minterms
+        all_ones = unique[0]
+        any_ones = unique[0]
+        for minterm in unique[1:]:
+            all_ones &= minterm
+            any_ones |= minterm
+        smaller = (all_ones, all_ones ^ any_ones)
+
+        for minterm in cube_minterms(smaller):
+            if minterm in on_set:
+                counts[minterm] += 1
+        reduced.append(smaller)
+
+    return reduced
+
+def cover_cost(cover: list[tuple[int, int]], bits: int) -> tuple[int, int]:
+    """
+    Cost of a cover as (number of cubes, number of literals).
+    """
+    return len(cover), sum(bits - mask.bit_count() for _, mask in cover)
+
+def is_essential_prime(implicant: tuple[int, int], on_set: set[int], care: set[int], bits: int) -> bool:
+    """
+    Checks if a prime contains a required minterm that no other prime can cover.
+    That is the case when none of the minterm's neighbours outside the cube can be covered.
+
+    Args:
+        implicant: Prime (value, mask) cube
+        on_set: Set of required minterms
+        care: Set of minterms that may be covered
+        bits: Number of variables
+    Returns:
+        True if the prime is essential, False otherwise
+    """
+    free = [1 << i for i in range(bits) if not (implicant[1] >> i) & 1]
+    for minterm in cube_minterms(implicant):
+        if minterm in on_set and all(minterm ^ bit not in care for bit in free):
+            return True
+    return False
+
+def espresso_pairs(on_set: set[int], dc_set: set[int], bits: int) -> tuple[list[tuple[int, int]], bool]:
+    """
+    Heuristic two-level minimization with an Espresso-style expand/irredundant/reduce loop.
+    The loop stops as soon as a pass does not lower the cost.
+
+    Args:
+        on_set: Set of required minterms
+        dc_set: Set of don't care minterms
+        bits: Number of variables
+    Returns:
+        Tuple of the cover as (value, mask) cubes and whether it is proven minimal
+    """
+    care = on_set | dc_set
+    cover = [(minterm, 0) for minterm in on_set]
+
+    cover = espresso_irredundant(espresso_expand(cover, on_set, care, bits), on_set)
+    best = cover
+    while cover:
+        cover = espresso_reduce(cover, on_set)
+        cover = espresso_irredundant(espresso_expand(cover, on_set, care, bits), on_set)
+        if cover_cost(cover, bits) >= cover_cost(best, bits):
+            break
+        best = cover
+
+    # A cover made only of essential primes is the unique minimum
+    proven_minimal = all(is_essential_prime(cube, on_set, care, bits) for cube in best)
+    return sorted(best, key=lambda cube: (cube[1], cube[0])), proven_minimal
+
+def espresso_minimize(table: TruthTable) -> tuple[list[str], bool]:
+    """
+    Finds a near-minimal cover of the required minterms without listing every prime.
+    Takes the same truth table as the exact path; for POS, pass its complement.
+
+    Args:
+        table: Truth table of the function
+    Returns:
+        Tuple of the cover as binary group strings and whether it is proven minimal
+    """
+    on_set = set(table.minterms())
+    dc_set = set(table.dont_cares())
+
+    cover, proven_minimal = espresso_pairs(on_set, dc_set, table.bits)
+    return [implicant_to_minterm(cube, table.bits) for cube in cover], proven_minimal
+
+# minterms = [
+#     {
+#         'binary': "0100",
+#         'required': True,
+#     },
+#     {
+#         'binary': "1000",
+#         'required': True,
+#     },
+#     {
+#         'binary': "1001",
+#         'required': False,
+#     },
+#     {
+#         'binary': "1010",
+#         'required': True,
+#     },
+#     {
+#         'binary': "1100",
+#         'required': True,
+#     },
+#     {
+#         'binary': "1011",
+#         'required': True,
+#     },
+#     {
+#         'binary': "1110",
+#         'required': False,
+#     },
+#     {
+#         'binary': "1111",
+#         'required': True
+#     }
+# ]
+
+def request_kmap_size() -> int:
+    return int(input("Please enter kmap size \n1=2x2\n2=2x4\n3=4x4\n4=4x8\nn=n+1 variables\n"))
+
+def request_analysis_type() -> int:
+    return int(input("Please enter analysis type \n1=SOP\n2=POS\n"))
+
+def request_input_type() -> int:
+    return int(input("Please enter input type \n1=kmap\n2=binary\n"))
+
+def request_solver_type() -> int:
+    return int(input("Please enter solver type \n1=exact\n2=heuristic\n"))
+
+def kmap_size_to_bits(kmap_size: int) -> int:
+    # kmap size 1 is the 2 variable 2x2 map, every step adds a variable
+    if kmap_size < 1:
+        raise ValueError("Invalid kmap size. Must be at least 1 (2x2)")
+    return kmap_size + 1
+
+def gray_code_order(n: int) -> list[str]:
+    # Generate all binary combinations in Gray code order
+    if n == 0:
+        return ['']
+    
+    smaller = gray_code_order(n-1)
+    result = []
+    # Reflect and prefix
+    for i in range(len(smaller)):
+        result.append('0' + smaller[i])
+    for i in range(len(smaller)-1, -1, -1):
+        result.append('1' + smaller[i])
+    return result
+
+def request_cell_value(binary: str) -> str:
+    while True:
+        value = input(str(binary) + "= ").upper()
+        if value in ['0', '1', '2', 'X']:
+            return value
+        print("Invalid input. Please enter 0, 1, or X")
+
+def request_kmap_input(kmap_size: int) -> TruthTable:
+    bits = kmap_size_to_bits(kmap_size)
+    on_set = []
+    dc_set = []
+
+    # Rows take the first half of the variables, columns the rest
+    row_codes = gray_code_order(bits//2)
+    col_codes = gray_code_order((bits+1)//2)
+    
+    print("Enter values for " + str(len(row_codes)) + "x" + str(len(col_codes)) + " K-map\n1=True\n0=False\nX=don't care")
+    
+    # Collect input for each cell
+    for row in row_codes:
+        for col in col_codes:
+            binary = row + col
+            value = request_cell_value(binary)
+            if value == '1':
+                on_set.append(int(binary, 2))
+            elif value in ['2', 'X']:
+                dc_set.append(int(binary, 2))
+    
+    return TruthTable.from_indices(bits, on_set, dc_set)
+
+def to_binary_with_bits(number, bits):
+    # Convert to binary and remove the '0b' prefix
+    binary_str = bin(number)[2:]
+    # Pad with zeros on the left to match the specified number of bits
+    padded_binary = '0' * (bits - len(binary_str)) + binary_str
+    # Truncate if the number is too large for the specified bits
+    return padded_binary[-bits:]
+
+def request_binary_input(kmap_size: int) -> TruthTable:
+    bits = kmap_size_to_bits(kmap_size)
+    on_set = []
+    dc_set = []
+
+    # Request all binary combs in norm order
+    for i in range(2 ** bits):
+        value = request_cell_value(to_binary_with_bits(i, bits))
+        if value == '1':
+            on_set.append(i)
+        elif value in ['2', 'X']:
+            dc_set.append(i)
+    return TruthTable.from_indices(bits, on_set, dc_set)
+
+
+def print_kmap(table: TruthTable) -> None:
+    # Rows take the first half of the variables, columns the rest
+    row_header = gray_code_order(table.bits // 2)
+    col_header = gray_code_order((table.bits + 1) // 2)
+    
+    # Print the K-map
+    # Print column headers
+    print(' ' * (len(row_header[0]) + 1), end='')
+    for header in col_header:
+        print('  ' + header, end='')
+    print()
+    
+    # Print rows with headers
+    for row in row_header:
+        print(' ' + row + ' ', end='')
+        for col in col_header:
+            value = table.get(int(row + col, 2))
+            print('  ' + value + ' ' * (len(col) - 1), end='')
+        print()
+
+def variable_names(bits: int) -> list[str]:
+    # A, B, C, ... while letters last, then numbered inputs
+    if bits <= 26:
+        return [chr(ord('A') + i) for i in range(bits)]
+    return ['x' + str(i) for i in range(bits)]
+
+def binary_groups_to_POS_expression(groups: list[str]) -> str:
+    # Groups are maxterm groups (covers of the zeros): a 0 bit is the plain variable
+    def term_to_expression(term: str) -> str:
+        expression_parts = []
+        variables = variable_names(len(term))
+        
+        for i, bit in enumerate(term):
+            if bit == '0':
+                expression_parts.append(variables[i])
+            elif bit == '1':
+                expression_parts.append(str(variables[i]) + "'")
+            # Skip '-' bits
+        
+        return '+'.join(expression_parts)
+    
+    # No clauses means nothing can make the function false
+    if not groups:
+        return '1'
+
+    # Convert each group to expression and wrap in parentheses
+    group_expressions = ["(" + str(term_to_expression(group) or '0') + ")" for group in groups]
+    return ''.join(group_expressions)
+
+def binary_groups_to_SOP_simplified_expression(groups: list[str]) -> str:
+    def term_to_expression(term: str) -> str:
+        expression_parts = []
+        variables = variable_names(len(term))
+        
+        for i, bit in enumerate(term):
+            if bit == '1':
+                expression_parts.append(variables[i])
+            elif bit == '0':
+                expression_parts.append(str(variables[i]) + "'")
+            # Skip '-' bits
+        
+        # Join without '+' to make product terms
+        return ''.join(expression_parts)
+
+    # No products means nothing can make the function true
+    if not groups:
+        return '0'
+
+    # Convert each group to expression
+    group_expressions = [term_to_expression(group) or '1' for group in groups]
+    
+    # Join with '+' to create sum of products
+    return '+'.join(group_expressions)
+
+@functools.lru_cache(maxsize=8)
+def variable_bitsets(bits: int) -> tuple[int, ...]:
+    """
+    Truth tables of the input variables as packed bitsets.
+
+    Args:
+        bits: Number of variables
+    Returns:
+        Tuple whose entry i has bit m set when variable i (A first) is 1 in minterm m
+    """
+    full = (1 << (1 << bits)) - 1
+    patterns = []
+    for i in range(bits):
+        # Variable i is bit p of the minterm: runs of 2^p zeros then 2^p ones
+        run = 1 << (bits - 1 - i)
+        period = ((1 << run) - 1) << run
+        patterns.append(period * (full // ((1 << (run << 1)) - 1)))
+    return tuple(patterns)
+
+def cover_bitset(groups: list[str], bits: int) -> int:
+    """
+    Evaluates a cover over every input at once.
+
+    Args:
+        groups: Binary group strings (e.g., ['1-0', '-11'])
+        bits: Number of variables
+    Returns:
+        Bitset of the minterms inside at least one group
+    """
+    full = (1 << (1 << bits)) - 1
+    variables = variable_bitsets(bits)
+    covered = 0
+    for group in groups:
+        cube = full
+        for i, bit in enumerate(group):
+            if bit == '1':
+                cube &= variables[i]
+            elif bit == '0':
+                cube &= full ^ variables[i]
+        covered |= cube
+    return covered
+
+def verify_cover(table: TruthTable, groups: list[str], form: str = 'SOP') -> list[int]:
+    """
+    Checks a minimized cover against its function, with a few big integer operations
+    per literal instead of one evaluation per minterm.
+
+    Args:
+        table: Truth table the cover was minimized from
+        groups: Binary group strings of the cover (maxterm groups for POS)
+        form: 'SOP' or 'POS'
+    Returns:
+        Minterm numbers where the expression disagrees with the table outside the
+        don't cares (empty when they are equivalent)
+    """
+    if form not in ['SOP', 'POS']:
+        raise ValueError("Invalid form. Must be 'SOP' or 'POS'")
+    value = cover_bitset(groups, table.bits)
+    if form == 'POS':
+        # A POS expression is 0 exactly on its maxterm groups
+        value ^= table.full()
+    return bitset_to_indices((value ^ table.on) & ~table.dc)
+
+def compile_cover(groups: list[str], form: str = 'SOP', vectorized: bool = False):
+    """
+    Compiles a minimized cover into a function evaluating it on minterm numbers.
+    Each group becomes one mask and compare, (x & care) == value, in generated source,
+    so the cover runs without parsing its expression.
+
+    Args:
+        groups: Binary group strings of the cover (maxterm groups for POS)
+        form: 'SOP' or 'POS'
+        vectorized: Build a NumPy function taking an integer array of minterm numbers
+            and returning a boolean array, instead of a function taking one int
+    Returns:
+        Function from minterm numbers (variable A in the most significant bit) to the
+        function value; its generated code is in its 'source' attribute
+    """
+    if form not in ['SOP', 'POS']:
+        raise ValueError("Invalid form. Must be 'SOP' or 'POS'")
+    if vectorized and np is None:
+        raise ImportError("NumPy is required for vectorized evaluation")
+
+    checks = []
+    for group in groups:
+        value, dashes = minterm_to_implicant(group)
+        care = ((1 << len(group)) - 1) ^ dashes
+        checks.append('(x & ' + hex(care) + ') == ' + hex(value))
+
+    # SOP is 1 inside any group, POS is 0 inside any group
+    if vectorized:
+        # One statement per group, ORed in place: a single long expression would nest too deep
+        lines = ['x = np.asarray(x)', 'y = np.zeros(x.shape, dtype=bool)']
+        lines += ['y |= ' + check for check in checks]
+        lines.append('return ~y' if form == 'POS' else 'return y')
+        body = '\n    '.join(lines)
+    else:
+        if checks:
+            body = ' or '.join(checks)
+            if form == 'POS':
+                body = 'not (' + body + ')'
+        else:
+            body = str(form == 'POS')
+        body = 'return ' + body
+
+    source = 'def evaluate(x):\n    ' + body + '\n'
+    namespace = {'np': np}
+    exec(source, namespace)
+    evaluate = namespace['evaluate']
+    evaluate.source = source
+    return evaluate
+
+def record_stage(stats: dict, stage: str, start: float) -> float:
+    """
+    Adds the time since start to one stage of a stats dictionary.
+
+    Args:
+        stats: Dictionary whose 'stages' entry collects seconds per stage (None to skip)
+        stage: Name of the stage that just finished
+        start: perf_counter value when the stage began
+    Returns:
+        The current perf_counter value, to start the next stage from (None when skipped)
+    """
+    if stats is None:
+        return None
+    now = time.perf_counter()
+    stages = stats.setdefault('stages', {})
+    stages[stage] = stages.get(stage, 0.0) + now - start
+    return now
+
+def solve_table(table: TruthTable, method: str = 'exact', engine: str = 'auto',
+                stats: dict = None, limit: int = None, cost=None,
+                executor: concurrent.futures.Executor = None) -> tuple[list[list[str]], bool]:
+    """
+    Finds SOP covers of the required minterms of a truth table.
+
+    Args:
+        table: Truth table of the function
+        method: 'exact' (every minimum cover) or 'heuristic' (one near-minimal cover)
+        engine: Prime implicant engine for the exact method (see use_dense_engine)
+        stats: Dictionary to fill with stage times and counters (None to skip, which
+            costs nothing)
+        limit: Most minimum covers to return for the exact method (None for all);
+            with 1 the enumeration pass is skipped entirely
+        cost: What the exact method minimizes: None for the number of products,
+            'literals' or a function from a binary group string to its cost
+        executor: Executor to solve independent blocks of the cover chart in parallel
+            (None for none, see find_minimum_cover and find_minimum_covers)
+    Returns:
+        Tuple of the covers (lists of binary group strings) and whether they are proven minimal
+    """
+    start = time.perf_counter() if stats is not None else None
+
+    if method == 'heuristic':
+        cover, proven_minimal = espresso_minimize(table)
+        record_stage(stats, 'heuristic', start)
+        return [cover], proven_minimal
+
+    required = table.minterms()
+    if engine == 'bdd':
+        prime_implicants = kmap_bdd.get_cover_prime_implicant_pairs_bdd(table.bits, table.on, table.care(), stats)
+    elif use_dense_engine(table, engine):
+        engine = 'numpy'
+        prime_implicants = get_prime_implicant_pairs_dense(table)
+    else:
+        engine = 'python'
+        prime_implicants = get_prime_implicant_pairs([(minterm, 0) for minterm in bitset_to_indices(table.care())],
+                                                     table.bits, stats)
+    start = record_stage(stats, 'primes', start)
+    rows = get_implicant_coverage(prime_implicants, required)
+    cost = get_cost_function(cost)
+    costs = None if cost is None else [cost(implicant_to_minterm(implicant, table.bits)) for implicant in prime_implicants]
+    start = record_stage(stats, 'chart', start)
+    if limit == 1:
+        cover = find_minimum_cover(rows, (1 << len(required)) - 1, stats=stats, costs=costs, executor=executor)
+        covers = [cover] if cover is not None else []
+    else:
+        covers = find_minimum_covers(rows, (1 << len(required)) - 1, stats, limit, costs, executor)
+    record_stage(stats, 'cover', start)
+
+    if stats is not None:
+        stats['engine'] = engine
+        stats['qm_depth'] = len(stats.get('qm_passes', []))
+        stats['primes'] = len(prime_implicants)
+        stats['chart_rows'] = len(rows)
+        stats['chart_columns'] = len(required)
+        stats['solutions'] = len(covers)
+    return [[implicant_to_minterm(prime_implicants[i], table.bits) for i in cover] for cover in covers], True
+
+def transform_minterm(minterm: int, bits: int, permutation: list[int], negations: list[bool]) -> int:
+    """
+    Moves a minterm into a permuted and negated variable order.
+    New variable j is old variable permutation[j], inverted if negations[j].
+
+    Args:
+        minterm: Minterm number in the old order
+        bits: Number of variables
+        permutation: Old variable position for each new position (0 = A)
+        negations: Whether each new variable is inverted
+    Returns:
+        Minterm number in the new order
+    """
+    result = 0
+    for j in range(bits):
+        bit = (minterm >> (bits - 1 - permutation[j])) & 1
+        result = (result << 1) | (bit ^ negations[j])
+    return result
+
+def transform_table(table: TruthTable, permutation: list[int], negations: list[bool]) -> TruthTable:
+    """ Applies transform_minterm to every required and don't care minterm """
+    on_set = [transform_minterm(m, table.bits, permutation, negations) for m in table.minterms()]
+    dc_set = [transform_minterm(m, table.bits, permutation, negations) for m in table.dont_cares()]
+    return TruthTable.from_indices(table.bits, on_set, dc_set)
+
+def untransform_cover(cover: list[str], permutation: list[int], negations: list[bool]) -> list[str]:
+    """
+    Maps binary group strings from a transformed variable order back to the original.
+
+    Args:
+        cover: List of binary group strings in the new order
+        permutation: Old variable position for each new position
+        negations: Whether each new variable is inverted
+    Returns:
+        List of binary group strings in the original order
+    """
+    flip = {'0': '1', '1': '0', '-': '-'}
+    original_cover = []
+    for group in cover:
+        original = [''] * len(group)
+        for j in range(len(group)):
+            original[permutation[j]] = flip[group[j]] if negations[j] else group[j]
+        original_cover.append(''.join(original))
+    return original_cover
+
+def canonicalize_table(table: TruthTable) -> tuple[TruthTable, list[int], list[bool]]:
+    """
+    Picks a representative of the functions equal to this one up to permuting and
+    negating inputs: each input is negated so that it is 1 in at least half of the
+    required minterms and the inputs are sorted by how often they are 1. That is cheap
+    and catches most equivalent functions, but ties can leave some of them with
+    different representatives.
+
+    Args:
+        table: Truth table of the function
+    Returns:
+        Tuple of the canonical table, the permutation and the negations that produce it
+    """
+    bits = table.bits
+
+    # Count how often each variable is 1
+    on_set = table.minterms()
+    dc_set = table.dont_cares()
+    signatures = []
+    negations_by_variable = []
+    for i in range(bits):
+        shift = bits - 1 - i
+        on_ones = sum((m >> shift) & 1 for m in on_set)
+        dc_ones = sum((m >> shift) & 1 for m in dc_set)
+        negate = (on_ones, dc_ones) < (len(on_set) - on_ones, len(dc_set) - dc_ones)
+        if negate:
+            on_ones = len(on_set) - on_ones
+            dc_ones = len(dc_set) - dc_ones
+        signatures.append((on_ones, dc_ones))
+        negations_by_variable.append(negate)
+
+    permutation = sorted(range(bits), key=lambda i: (-signatures[i][0], -signatures[i][1], i))
+    negations = [negations_by_variable[i] for i in permutation]
+    return transform_table(table, permutation, negations), permutation, negations
+
+class MinimizationCache:
+    """ Bounded LRU of solve_table results keyed on the truth table, with an optional shelve store """
+
+    def __init__(self, maxsize: int = 1024, npn: bool = False, path: str = None):
+        self.maxsize = maxsize
+        self.npn = npn
+        self.entries = collections.OrderedDict()
+        self.store = shelve.open(path) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, table: TruthTable, method: str, limit: int = None, cost: str = None) -> str:
+        """ Cache key for a table, method, cover limit and named cost """
+        key = method + ':' + str(table.bits) + ':' + format(table.on, 'x') + ':' + format(table.dc, 'x')
+        if limit is not None:
+            key += ':' + str(limit)
+        if cost is not None:
+            key += ':' + cost
+        return key
+
+    def get(self, key: str):
+        """ Look up a key in memory, then on disk. Returns None on a miss """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.store is not None and key in self.store:
+            entry = self.store[key]
+            self.remember(key, entry)
+            return entry
+        return None
+
+    def remember(self, key: str, entry: tuple) -> None:
+        """ Store an entry in memory, evicting the least recently used one when full """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def put(self, key: str, entry: tuple) -> None:
+        """ Store an entry in memory and on disk """
+        self.remember(key, entry)
+        if self.store is not None:
+            self.store[key] = entry
+
+    def solve(self, table: TruthTable, method: str = 'exact', engine: str = 'auto',
+              stats: dict = None, limit: int = None, cost: str = None,
+              executor: concurrent.futures.Executor = None) -> tuple[list[list[str]], bool]:
+        """
+        Same as solve_table, but reuses the result of an equal (or, with npn,
+        equivalent) table solved before. Tables with fewer than NPN_MIN_BITS
+        variables are only shared with equal tables. A hit sets 'cache_hit' in stats and
+        records no solver counters. Only named costs can be cached, since a cost
+        function has no stable key.
+        """
+        if callable(cost):
+            raise ValueError("Invalid cost for a cache. Must be None or 'literals'")
+        npn = self.npn and table.bits >= NPN_MIN_BITS
+        if npn:
+            canonical, permutation, negations = canonicalize_table(table)
+        else:
+            canonical = table
+
+        key = self.key(canonical, method, limit, cost)
+        entry = self.get(key)
+        hit = entry is not None
+        if not hit:
+            self.misses += 1
+            entry = solve_table(canonical, method, engine, stats, limit, cost, executor)
+            self.put(key, entry)
+        else:
+            self.hits += 1
+        if stats is not None:
+            stats['cache_hit'] = hit
+
+        # Copy the covers so a caller changing its result cannot change the cache
+        covers = [list(cover) for cover in entry[0]]
+        proven_minimal = entry[1]
+        if npn:
+            covers = [untransform_cover(cover, permutation, negations) for cover in covers]
+            # Keep the usual order of groups and covers: primes by (mask, value), covers by their primes
+            implicant_order = lambda group: minterm_to_implicant(group)[::-1]
+            covers = [sorted(cover, key=implicant_order) for cover in covers]
+            covers.sort(key=lambda cover: [implicant_order(group) for group in cover])
+        return covers, proven_minimal
+
+    def close(self) -> None:
+        """ Flush and close the on-disk store """
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+def minimize_table(table: TruthTable, form: str = 'SOP', method: str = 'exact',
+                   cache: MinimizationCache = None, engine: str = 'auto', stats=None,
+                   limit: int = None, first_only: bool = False, cost=None, verify: bool = False,
+                   executor: concurrent.futures.Executor = None) -> dict:
+    """
+    Minimizes a truth table into SOP or POS form.
+
+    Args:
+        table: Truth table of the function
+        form: 'SOP' or 'POS'
+        method: 'exact' (every minimum cover) or 'heuristic' (one near-minimal cover)
+        cache: Cache to reuse earlier results from (None to always solve)
+        engine: Prime implicant engine, 'auto', 'python', 'numpy' or 'bdd' (primes
+            kept implicitly as a ZDD while the essential ones are taken and the ones
+            no minimum cover needs are dropped; only the rest are listed for the
+            explicit cover chart, see kmap_bdd)
+        stats: Dictionary to fill with instrumentation, or a function called with that
+            dictionary once the solve is done (None turns instrumentation off). It holds
+            seconds per stage in 'stages' and 'total', the prime 'engine', a 'qm_passes'
+            list of terms, comparisons and merges, 'qm_depth', 'primes', 'chart_rows', 'chart_columns',
+            'cover_explored', 'cover_pruned', 'cover_components' (independent blocks of the
+            chart), 'solutions', 'bdd_nodes', 'zdd_nodes', 'zdd_primes' (all primes, of
+            which 'primes' were listed) and 'essential_primes' for the bdd engine and,
+            with a cache, 'cache_hit'
+        limit: Most minimum covers to find (None for all of them); the search stops
+            once it has this many
+        first_only: Only find one minimum cover (same as limit=1)
+        cost: What the exact method minimizes: None for the number of products,
+            'literals' for the number of literals, or a function from a binary group
+            string to its cost (such results are never cached)
+        verify: Check every cover against the table (see verify_cover) and add the
+            'mismatches' found for each one to the result
+        executor: Executor to solve independent blocks of the cover chart in parallel,
+            e.g. a concurrent.futures.ProcessPoolExecutor (None to solve them here)
+    Returns:
+        Dictionary with the 'form', 'method', 'bits', 'covers' (lists of binary group
+        strings, maxterm groups for POS), 'expressions' and whether the result is 'proven_minimal'
+    """
+    if form not in ['SOP', 'POS']:
+        raise ValueError("Invalid form. Must be 'SOP' or 'POS'")
+    if method not in ['exact', 'heuristic']:
+        raise ValueError("Invalid method. Must be 'exact' or 'heuristic'")
+    if first_only:
+        limit = 1
+    if limit is not None and limit < 1:
+        raise ValueError("Invalid limit. Must be at least 1")
+
+    callback = None
+    if callable(stats):
+        callback = stats
+        stats = {}
+    start = time.perf_counter() if stats is not None else None
+
+    # POS minimizes the zeros of the function; each group of zeros is one sum term
+    original = table
+    if form == 'POS':
+        table = table.complement()
+
+    # POS and SOP share cache entries, since both are SOP covers of some table
+    if cache is not None and not callable(cost):
+        covers, proven_minimal = cache.solve(table, method, engine, stats, limit, cost, executor)
+    else:
+        covers, proven_minimal = solve_table(table, method, engine, stats, limit, cost, executor)
+
+    if form == 'POS':
+        expressions = [binary_groups_to_POS_expression(cover) for cover in covers]
+    else:
+        expressions = [binary_groups_to_SOP_simplified_expression(cover) for cover in covers]
+
+    result = {
+        'form': form,
+        'method': method,
+        'bits': table.bits,
+        'covers': covers,
+        'expressions': expressions,
+        'proven_minimal': proven_minimal
+    }
+    if verify:
+        verify_start = time.perf_counter() if stats is not None else None
+        result['mismatches'] = [verify_cover(original, cover, form) for cover in covers]
+        record_stage(stats, 'verify', verify_start)
+
+    if stats is not None:
+        stats['total'] = time.perf_counter() - start
+        if callback is not None:
+            callback(stats)
+
+    return result
+
+def minimize(on_set, dc_set=(), form: str = 'SOP', bits: int = None, method: str = 'exact',
+             cache: MinimizationCache = None, engine: str = 'auto', stats=None,
+             limit: int = None, first_only: bool = False, cost=None, verify: bool = False,
+             executor: concurrent.futures.Executor = None) -> dict:
+    """
+    Minimizes a function given as lists of minterm numbers.
+
+    Args:
+        on_set: Required minterm numbers
+        dc_set: Don't care minterm numbers
+        form: 'SOP' or 'POS'
+        bits: Number of variables (defaults to the fewest that fit every minterm)
+        method: 'exact' or 'heuristic'
+        cache: Cache to reuse earlier results from (None to always solve)
+        engine: Prime implicant engine, 'auto', 'python', 'numpy' or 'bdd'
+        stats: Instrumentation dictionary or callback (see minimize_table)
+        limit: Most minimum covers to find (None for all of them)
+        first_only: Only find one minimum cover
+        cost: None, 'literals' or a cost function (see minimize_table)
+        verify: Add the 'mismatches' of every cover to the result
+        executor: Executor to solve independent chart blocks in (see minimize_table)
+    Returns:
+        Result dictionary from minimize_table
+    """
+    on_set = list(on_set)
+    dc_set = list(dc_set)
+    if bits is None:
+        bits = max([1] + [minterm.bit_length() for minterm in on_set + dc_set])
+    if any(minterm < 0 or minterm >= 2 ** bits for minterm in on_set + dc_set):
+        raise ValueError("Minterm out of range for " + str(bits) + " variables")
+
+    return minimize_table(TruthTable.from_indices(bits, on_set, dc_set), form, method, cache, engine, stats,
+                          limit, first_only, cost, verify, executor)
+
+def get_multi_output_prime_implicants(tables: list[TruthTable]) -> list[tuple[int, int, int]]:
+    """
+    Finds the prime implicants of several functions over the same inputs in one pass.
+    Every term carries a tag with bit k set when it is an implicant of output k.
+    Merging two terms intersects their tags, and a term only counts as merged when
+    the merged term keeps its whole tag, so the result holds every product worth
+    sharing between some group of outputs.
+
+    Args:
+        tables: Truth tables of the outputs (all with the same number of variables)
+    Returns:
+        List of (value, mask, tag) triples
+    """
+    bits = tables[0].bits
+    full = (1 << bits) - 1
+
+    current = {}
+    for output, table in enumerate(tables):
+        for minterm in bitset_to_indices(table.care()):
+            current[(minterm, 0)] = current.get((minterm, 0), 0) | (1 << output)
+
+    prime_implicants = []
+    while current:
+        # Group terms by (mask, number of ones)
+        groups = {}
+        for (value, mask), tag in current.items():
+            groups.setdefault((mask, value.bit_count()), {})[value] = tag
+
+        merged = set()
+        next_level = {}
+        for (mask, ones), group in groups.items():
+            upper = groups.get((mask, ones + 1))
+            if not upper:
+                continue
+            for value, tag in group.items():
+                free = full & ~(value | mask)
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    upper_tag = upper.get(value | bit)
+                    if not upper_tag or not tag & upper_tag:
+                        continue
+                    merged_tag = tag & upper_tag
+                    next_level[(value, mask | bit)] = merged_tag
+                    if merged_tag == tag:
+                        merged.add((value, mask))
+                    if merged_tag == upper_tag:
+                        merged.add((value | bit, mask))
+
+        for (value, mask), tag in current.items():
+            if (value, mask) not in merged:
+                prime_implicants.append((value, mask, tag))
+        current = next_level
+
+    return sorted(prime_implicants, key=lambda implicant: (implicant[1], implicant[0], implicant[2]))
+
+def minimize_multi_table(tables: list[TruthTable], form: str = 'SOP') -> dict:
+    """
+    Minimizes several outputs together so that products are shared between them.
+    Each chart column is one required minterm of one output, and a tagged prime covers
+    its minterms in every output of its tag. One minimum cover of that chart uses the
+    fewest distinct products. Each output then keeps the chosen products it needs.
+
+    Args:
+        tables: Truth tables of the outputs (all with the same number of variables)
+        form: 'SOP' or 'POS' (POS shares sum terms between the outputs' zeros)
+    Returns:
+        Dictionary with the 'form', 'bits', shared 'products' (binary group strings,
+        maxterm groups for POS),
+        the products used by each of the 'outputs' and the 'expressions' per output
+    """
+    if form not in ['SOP', 'POS']:
+        raise ValueError("Invalid form. Must be 'SOP' or 'POS'")
+    if not tables:
+        raise ValueError("At least one output is required")
+    bits = tables[0].bits
+    if any(table.bits != bits for table in tables):
+        raise ValueError("Every output must have the same number of variables")
+
+    # POS minimizes the zeros of each output
+    if form == 'POS':
+        tables = [table.complement() for table in tables]
+
+    prime_implicants = get_multi_output_prime_implicants(tables)
+
+    # Build one column per (output, required minterm)
+    rows = [0] * len(prime_implicants)
+    offset = 0
+    required_by_output = []
+    for output, table in enumerate(tables):
+        required = table.minterms()
+        required_by_output.append(required)
+        members = [i for i in range(len(prime_implicants)) if (prime_implicants[i][2] >> output) & 1]
+        coverage = get_implicant_coverage([prime_implicants[i][:2] for i in members], required)
+        for i, row in zip(members, coverage):
+            rows[i] |= row << offset
+        offset += len(required)
+
+    cover = find_minimum_cover(rows, (1 << offset) - 1)
+
+    # Give every output the chosen products it needs, dropping ones other products cover
+    outputs = []
+    for output, required in enumerate(required_by_output):
+        chosen = [prime_implicants[i][:2] for i in cover if (prime_implicants[i][2] >> output) & 1]
+        coverage = get_implicant_coverage(chosen, required)
+        kept = list(range(len(chosen)))
+        for i in sorted(range(len(chosen)), key=lambda i: coverage[i].bit_count()):
+            others = 0
+            for j in kept:
+                if j != i:
+                    others |= coverage[j]
+            if not coverage[i] & ~others:
+                kept.remove(i)
+        outputs.append([implicant_to_minterm(chosen[i], bits) for i in kept])
+
+    products = [implicant_to_minterm(prime_implicants[i][:2], bits) for i in cover]
+    if form == 'POS':
+        expressions = [binary_groups_to_POS_expression(groups) for groups in outputs]
+    else:
+        expressions = [binary_groups_to_SOP_simplified_expression(groups) for groups in outputs]
+
+    return {
+        'form': form,
+        'bits': bits,
+        'products': products,
+        'outputs': outputs,
+        'expressions': expressions
+    }
+
+def minimize_multi(on_sets: list, dc_sets: list = None, form: str = 'SOP', bits: int = None) -> dict:
+    """
+    Minimizes several outputs given as lists of minterm numbers, sharing products.
+
+    Args:
+        on_sets: Required minterm numbers for each output
+        dc_sets: Don't care minterm numbers for each output (None for none)
+        form: 'SOP' or 'POS'
+        bits: Number of variables (defaults to the fewest that fit every minterm)
+    Returns:
+        Result dictionary from minimize_multi_table
+    """
+    on_sets = [list(on_set) for on_set in on_sets]
+    dc_sets = [list(dc_set) for dc_set in dc_sets] if dc_sets is not None else [[] for _ in on_sets]
+    if len(dc_sets) != len(on_sets):
+        raise ValueError("Need one don't care list per output")
+
+    everything = [minterm for minterms in on_sets + dc_sets for minterm in minterms]
+    if bits is None:
+        bits = max([1] + [minterm.bit_length() for minterm in everything])
+    if any(minterm < 0 or minterm >= 2 ** bits for minterm in everything):
+        raise ValueError("Minterm out of range for " + str(bits) + " variables")
+
+    tables = [TruthTable.from_indices(bits, on_set, dc_set) for on_set, dc_set in zip(on_sets, dc_sets)]
+    return minimize_multi_table(tables, form)
+
+def cube_contains(outer: tuple[int, int], inner: tuple[int, int]) -> bool:
+    """ Checks if the cube inner lies inside the cube outer """
+    return inner[1] & outer[1] == inner[1] and inner[0] & ~outer[1] == outer[0]
+
+class IncrementalSolver:
+    """
+    Keeps the prime implicants and cover chart of one function between single cell edits.
+    Only primes touching the edited cell are recomputed. Rows keep their numbers and
+    the chart keeps a column index between edits, so an edit only updates the rows
+    and columns it touches. Solving re-searches just the block of the chart that the
+    edits since the last solve are connected to, starting from the previous cover
+    of that block; the rest of the cover is kept as it is.
+    """
+
+    def __init__(self, table: TruthTable, form: str = 'SOP'):
+        if form not in ['SOP', 'POS']:
+            raise ValueError("Invalid form. Must be 'SOP' or 'POS'")
+        self.bits = table.bits
+        self.form = form
+
+        # Cell states: 0 = off, 1 = required, 2 = don't care (POS works on the zeros)
+        self.cells = bytearray(1 << self.bits)
+        required = table.on if form == 'SOP' else table.full() & ~table.care()
+        for minterm in bitset_to_indices(required):
+            self.cells[minterm] = 1
+        for minterm in table.dont_cares():
+            self.cells[minterm] = 2
+
+        care = [minterm for minterm in range(1 << self.bits) if self.cells[minterm]]
+
+        # Chart: one column per required minterm, one bitmask row per prime.
+        # Rows and columns are numbered, and freed numbers are reused.
+        self.columns = {}
+        self.free_columns = []
+        self.universe = 0
+        self.column_rows = {}
+        self.primes = {}
+        self.row_primes = []
+        self.row_masks = []
+        self.free_rows = []
+        # Columns whose block of the chart changed since the last solve
+        self.dirty = 0
+        for minterm in care:
+            if self.cells[minterm] == 1:
+                self.add_column(minterm)
+        for prime in get_prime_implicant_pairs([(minterm, 0) for minterm in care], self.bits):
+            self.add_row(prime)
+        self.cover = []
+
+    def is_implicant(self, cube: tuple[int, int]) -> bool:
+        """ True if every minterm of the cube may be covered """
+        for minterm in cube_minterms(cube):
+            if not self.cells[minterm]:
+                return False
+        return True
+
+    def is_prime(self, cube: tuple[int, int]) -> bool:
+        """ True if no literal of an implicant can be turned into a dash """
+        free = ((1 << self.bits) - 1) & ~cube[1]
+        while free:
+            bit = free & -free
+            free ^= bit
+            if self.is_implicant((cube[0] & ~bit, cube[1] | bit)):
+                return False
+        return True
+
+    def coverage(self, prime: tuple[int, int]) -> int:
+        """ Bitmask of the chart columns a prime covers """
+        row = 0
+        if 1 << prime[1].bit_count() <= len(self.columns):
+            for minterm in cube_minterms(prime):
+                column = self.columns.get(minterm)
+                if column is not None:
+                    row |= 1 << column
+        else:
+            for minterm, column in self.columns.items():
+                if minterm & ~prime[1] == prime[0]:
+                    row |= 1 << column
+        return row
+
+    def add_row(self, prime: tuple[int, int]) -> None:
+        row = self.free_rows.pop() if self.free_rows else len(self.row_masks)
+        if row == len(self.row_masks):
+            self.row_primes.append(None)
+            self.row_masks.append(0)
+        coverage = self.coverage(prime)
+        self.primes[prime] = row
+        self.row_primes[row] = prime
+        self.row_masks[row] = coverage
+        for column in bitset_to_indices(coverage):
+            self.column_rows[column] |= 1 << row
+        self.dirty |= coverage
+
+    def remove_row(self, prime: tuple[int, int]) -> None:
+        row = self.primes.pop(prime)
+        coverage = self.row_masks[row]
+        for column in bitset_to_indices(coverage):
+            self.column_rows[column] &= ~(1 << row)
+        self.row_primes[row] = None
+        self.row_masks[row] = 0
+        self.free_rows.append(row)
+        self.dirty |= coverage
+
+    def add_column(self, minterm: int) -> None:
+        column = self.free_columns.pop() if self.free_columns else len(self.columns)
+        self.columns[minterm] = column
+        self.universe |= 1 << column
+        covering = 0
+        for prime, row in self.primes.items():
+            if minterm & ~prime[1] == prime[0]:
+                self.row_masks[row] |= 1 << column
+                covering |= 1 << row
+        self.column_rows[column] = covering
+        self.dirty |= 1 << column
+
+    def remove_column(self, minterm: int) -> None:
+        column = self.columns.pop(minterm)
+        self.free_columns.append(column)
+        self.universe &= ~(1 << column)
+        # The rows through the column may now be the only link between parts of its block
+        for row in bitset_to_indices(self.column_rows.pop(column)):
+            self.row_masks[row] &= ~(1 << column)
+            self.dirty |= self.row_masks[row]
+
+    def primes_containing(self, minterm: int) -> set[tuple[int, int]]:
+        """ Every prime implicant that contains a minterm, found by expanding it level by level """
+        primes = set()
+        level = {(minterm, 0)}
+        while level:
+            next_level = set()
+            for cube in level:
+                expanded = False
+                free = ((1 << self.bits) - 1) & ~cube[1]
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    larger = (cube[0] & ~bit, cube[1] | bit)
+                    if larger in next_level or self.is_implicant(larger):
+                        next_level.add(larger)
+                        expanded = True
+                if not expanded:
+                    primes.add(cube)
+            level = next_level
+        return primes
+
+    def set_cell(self, minterm: int, value: str) -> None:
+        """
+        Changes one cell and updates the primes and chart columns it affects.
+
+        Args:
+            minterm: Minterm number of the cell
+            value: '1', '0' or 'X'
+        """
+        if value not in ['0', '1', 'X']:
+            raise ValueError("Invalid cell value. Must be 0, 1, or X")
+        state = {'0': 0, '1': 1, 'X': 2}[value]
+        if self.form == 'POS' and state != 2:
+            state = 1 - state
+        old_state = self.cells[minterm]
+        if state == old_state:
+            return
+
+        if old_state == 1:
+            self.remove_column(minterm)
+        self.cells[minterm] = state
+
+        if old_state == 0:
+            # Coverable now: new primes all contain the cell, and they may swallow old ones
+            new_primes = self.primes_containing(minterm) - self.primes.keys()
+            for prime in [p for p in self.primes if any(cube_contains(q, p) for q in new_primes)]:
+                self.remove_row(prime)
+            for prime in new_primes:
+                self.add_row(prime)
+        elif state == 0:
+            # No longer coverable: primes through the cell split into their largest subcubes avoiding it
+            removed = [p for p in self.primes if minterm & ~p[1] == p[0]]
+            candidates = set()
+            for value_bits, mask in removed:
+                self.remove_row((value_bits, mask))
+                free = mask
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    candidates.add((value_bits | (~minterm & bit), mask & ~bit))
+            for candidate in candidates:
+                if candidate not in self.primes and self.is_prime(candidate):
+                    self.add_row(candidate)
+
+        if state == 1:
+            self.add_column(minterm)
+
+    def changed_block(self) -> tuple[int, int]:
+        """
+        Finds the part of the chart linked to the columns changed since the last solve.
+        Every other block is unchanged, so its part of the previous cover stays minimum.
+
+        Returns:
+            Tuple of the row and column bitmasks of that part
+        """
+        block_rows = 0
+        block_columns = 0
+        frontier = self.dirty & self.universe
+        while frontier:
+            block_columns |= frontier
+            new_rows = 0
+            for column in bitset_to_indices(frontier):
+                new_rows |= self.column_rows[column]
+            new_rows &= ~block_rows
+            block_rows |= new_rows
+            frontier = 0
+            for row in bitset_to_indices(new_rows):
+                frontier |= self.row_masks[row]
+            frontier &= ~block_columns
+        return block_rows, block_columns
+
+    def solve(self) -> list[str]:
+        """
+        Finds a minimum cover, re-solving only the block of the chart that changed.
+
+        Returns:
+            List of binary group strings (maxterm groups for POS)
+        """
+        block_rows, block_columns = self.changed_block()
+        self.dirty = 0
+        # Primes whose columns all went away drop out with no block to re-solve
+        cover = [prime for prime in self.cover if prime in self.primes and self.row_masks[self.primes[prime]]]
+
+        if block_columns:
+            row_numbers = bitset_to_indices(block_rows)
+            position = {row: i for i, row in enumerate(row_numbers)}
+            rows = [self.row_masks[row] for row in row_numbers]
+
+            # Repair the block's part of the last cover: keep what still exists, then add the widest primes for the gaps
+            initial = [position[self.primes[prime]] for prime in cover if self.primes[prime] in position]
+            cover = [prime for prime in cover if self.primes[prime] not in position]
+            covered = 0
+            for i in initial:
+                covered |= rows[i]
+            while block_columns & ~covered:
+                best = max(range(len(rows)), key=lambda i: (rows[i] & ~covered).bit_count())
+                initial.append(best)
+                covered |= rows[best]
+
+            # A repaired cover that meets the lower bound needs no search
+            column_index = {column: self.column_rows[column] for column in bitset_to_indices(block_columns)}
+            if len(initial) > cover_lower_bound(column_index):
+                initial = find_minimum_cover(rows, block_columns, initial)
+            cover += [self.row_primes[row_numbers[i]] for i in initial]
+
+        self.cover = sorted(cover, key=lambda prime: (prime[1], prime[0]))
+        groups = [implicant_to_minterm(prime, self.bits) for prime in self.cover]
+        return groups
+
+    def expression(self) -> str:
+        """ Minimized expression for the current cells """
+        groups = self.solve()
+        if self.form == 'POS':
+            return binary_groups_to_POS_expression(groups)
+        return binary_groups_to_SOP_simplified_expression(groups)
+
+def fill_cube(bitset: bytearray, implicant: tuple[int, int]) -> None:
+    """
+    Sets the bit of every minterm inside a cube in a packed bitset.
+    Dashes on the low variables make runs of consecutive minterms, which are
+    written a whole byte at a time.
+
+    Args:
+        bitset: Little-endian packed bitset (bit i of the whole buffer is minterm i)
+        implicant: Tuple of value and mask
+    """
+    value, mask = implicant
+    run_bits = (~mask & (mask + 1)).bit_length() - 1  # Trailing dashes
+    run = 1 << run_bits
+    for base in cube_minterms((value, mask & ~(run - 1))):
+        if run >= 8:
+            bitset[base >> 3:(base + run) >> 3] = b'\xff' * (run >> 3)
+        else:
+            for minterm in range(base, base + run):
+                bitset[minterm >> 3] |= 1 << (minterm & 7)
+
+def read_pla(path: str) -> dict:
+    """
+    Reads a Berkeley PLA file into one packed truth table per output.
+    The file is streamed line by line and every cube is written straight into
+    on, off and don't care bitsets, so no per-minterm objects are created.
+    Types f, fd, fr, fdr, r and dr are understood (fd when .type is missing):
+    an output '1' is in the on-set when the type has f, '0' in the off-set when
+    it has r, and '-' or '2' a don't care when it has d; '~' means nothing.
+    Whatever the file leaves unspecified is off when only f is given, on when
+    only r is given, and a don't care when both are.
+
+    Args:
+        path: PLA file to read
+    Returns:
+        Dictionary with 'bits', 'type', 'input_names', 'output_names' and 'tables'
+        (a TruthTable per output)
+    """
+    bits = None
+    num_outputs = None
+    pla_type = 'fd'
+    input_names = None
+    output_names = None
+    sets = None
+
+    with open(path) as file:
+        for line in file:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+
+            if line.startswith('.'):
+                fields = line.split()
+                keyword = fields[0]
+                if keyword == '.i':
+                    bits = int(fields[1])
+                elif keyword == '.o':
+                    num_outputs = int(fields[1])
+                elif keyword == '.type':
+                    pla_type = fields[1]
+                    if pla_type not in ['f', 'fd', 'fr', 'fdr', 'r', 'dr']:
+                        raise ValueError("Invalid PLA type. Must be f, fd, fr, fdr, r or dr")
+                elif keyword == '.ilb':
+                    input_names = fields[1:]
+                elif keyword == '.ob':
+                    output_names = fields[1:]
+                elif keyword == '.e' or keyword == '.end':
+                    break
+                # .p, .phase and other directives are not needed
+                continue
+
+            cube = ''.join(line.split())
+            if bits is None or num_outputs is None:
+                raise ValueError("PLA cube found before .i and .o")
+            if len(cube) != bits + num_outputs:
+                raise ValueError("Invalid PLA cube. Must have " + str(bits) + " inputs and " + str(num_outputs) + " outputs")
+            if sets is None:
+                sets = [{kind: bytearray(((1 << bits) + 7) // 8) for kind in 'frd'} for _ in range(num_outputs)]
+
+            inputs = cube[:bits].replace('2', '-')
+            if inputs.strip('01-'):
+                raise ValueError("Invalid PLA input value. Must be 0, 1, - or 2")
+            implicant = minterm_to_implicant(inputs)
+            for output, value in enumerate(cube[bits:]):
+                kind = PLA_OUTPUT_KINDS.get(value)
+                if kind is None:
+                    raise ValueError("Invalid PLA output value. Must be 0, 1, -, 2 or ~")
+                if kind and kind in pla_type:
+                    fill_cube(sets[output][kind], implicant)
+
+    if bits is None or num_outputs is None:
+        raise ValueError("PLA file is missing .i or .o")
+    if sets is None:
+        sets = [{kind: bytearray(((1 << bits) + 7) // 8) for kind in 'frd'} for _ in range(num_outputs)]
+
+    tables = []
+    full = (1 << (1 << bits)) - 1
+    for output_sets in sets:
+        on = int.from_bytes(output_sets['f'], 'little')
+        off = int.from_bytes(output_sets['r'], 'little')
+        dc = int.from_bytes(output_sets['d'], 'little')
+        if 'f' in pla_type and 'r' in pla_type:
+            dc |= full & ~(on | off)
+        elif 'r' in pla_type:
+            on = full & ~(off | dc)
+        tables.append(TruthTable(bits, on, dc & ~off))
+
+    return {
+        'bits': bits,
+        'type': pla_type,
+        'input_names': input_names,
+        'output_names': output_names,
+        'tables': tables
+    }
+
+def write_pla(output, result: dict, input_names: list[str] = None, output_names: list[str] = None) -> None:
+    """
+    Writes a minimized result as a PLA file.
+    SOP results are written as type f with the products of each output; POS results
+    as type r with the maxterm groups (the off-set cubes) of each output.
+
+    Args:
+        output: Text stream to write to
+        result: Result dictionary from minimize_table (its first cover is written)
+            or from minimize_multi_table
+        input_names: Names for the .ilb line (None to leave it out)
+        output_names: Names for the .ob line (None to leave it out)
+    """
+    if 'outputs' in result:
+        products = result['products']
+        outputs = result['outputs']
+    else:
+        products = result['covers'][0] if result['covers'] else []
+        outputs = [products]
+
+    used = '1' if result['form'] == 'SOP' else '0'
+    lines = []
+    for product in products:
+        flags = ''.join(used if product in groups else '~' for groups in outputs)
+        lines.append(product + ' ' + flags)
+
+    output.write('.i ' + str(result['bits']) + '\n')
+    output.write('.o ' + str(len(outputs)) + '\n')
+    if input_names:
+        output.write('.ilb ' + ' '.join(input_names) + '\n')
+    if output_names:
+        output.write('.ob ' + ' '.join(output_names) + '\n')
+    output.write('.type ' + ('f' if result['form'] == 'SOP' else 'r') + '\n')
+    output.write('.p ' + str(len(lines)) + '\n')
+    for line in lines:
+        output.write(line + '\n')
+    output.write('.e\n')
+
+def read_hex_table(path: str, bits: int = None) -> TruthTable:
+    """
+    Reads a hex truth table: the on-set as one hex number where bit i is minterm i,
+    optionally followed by the don't care set in the same form. Each number may be
+    wrapped over several lines; a blank line or a line starting with '#' ends it.
+    A '# bits N' line gives the number of variables, since one hex digit holds
+    either a 1 or a 2 variable table.
+    The file is memory-mapped and each number is parsed straight from the mapping.
+
+    Args:
+        path: File to read
+        bits: Number of variables (defaults to the '# bits' line, or else to what
+            the length of the on-set implies)
+    Returns:
+        Truth table of the function
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError("Hex truth table is empty")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            numbers = []
+            digits = []
+            header_bits = None
+            for line in iter(data.readline, b''):
+                line = line.strip()
+                if line.startswith(b'# bits '):
+                    header_bits = int(line[7:])
+                if line.startswith(b'0x'):
+                    line = line[2:]
+                if line and not line.startswith(b'#'):
+                    digits.append(line)
+                elif digits:
+                    numbers.append(b''.join(digits))
+                    digits = []
+            if digits:
+                numbers.append(b''.join(digits))
+
+    if not numbers or len(numbers) > 2:
+        raise ValueError("Invalid hex truth table. Must hold an on-set and an optional don't care set")
+    if bits is None:
+        bits = header_bits
+    if bits is None:
+        bits = max(1, (len(numbers[0]) * 4).bit_length() - 1)
+    on = int(numbers[0], 16)
+    dc = int(numbers[1], 16) if len(numbers) > 1 else 0
+    if (on | dc) >> (1 << bits):
+        raise ValueError("Hex truth table has more than 2^" + str(bits) + " entries")
+    return TruthTable(bits, on, dc)
+
+def write_hex_table(output, table: TruthTable) -> None:
+    """
+    Writes a truth table in the form read_hex_table reads, with a '# bits' line.
+
+    Args:
+        output: Text stream to write to
+        table: Truth table to write
+    """
+    width = max(1, (1 << table.bits) // 4)
+    output.write('# bits ' + str(table.bits) + '\n')
+    output.write(format(table.on, '0' + str(width) + 'x') + '\n')
+    if table.dc:
+        output.write('\n' + format(table.dc, '0' + str(width) + 'x') + '\n')
+
+# Per-process cache used by pool workers (see start_worker_cache)
+worker_cache = None
+
+def start_worker_cache(maxsize: int, npn: bool) -> None:
+    # Pool initializer; workers keep their own in-memory cache
+    global worker_cache
+    worker_cache = MinimizationCache(maxsize, npn)
+
+def raise_timeout(signum, frame):
+    raise TimeoutError("Minimization timed out")
+
+def check_request_bits(request: dict) -> None:
+    """
+    Rejects a batch request whose minterms are not all integers, or whose truth tables
+    would have more than 2^MAX_REQUEST_BITS entries, before any of them is built.
+    Without "bits", the largest minterm decides.
+
+    Args:
+        request: Request dictionary (see minimize_request)
+    """
+    bits = request.get('bits')
+    if bits is not None:
+        if isinstance(bits, bool) or not isinstance(bits, int) or not 1 <= bits <= MAX_REQUEST_BITS:
+            raise ValueError("Invalid bits. Must be an integer from 1 to " + str(MAX_REQUEST_BITS))
+
+    parts = request['outputs'] if 'outputs' in request else [request]
+    for part in parts:
+        if isinstance(part, dict):
+            for minterm in itertools.chain(part.get('on', ()), part.get('dc', ())):
+                if isinstance(minterm, bool) or not isinstance(minterm, int):
+                    raise ValueError("Invalid minterm " + json.dumps(minterm) + ". Must be an integer")
+                if bits is None and minterm >= 1 << MAX_REQUEST_BITS:
+                    raise ValueError("Minterm out of range for " + str(MAX_REQUEST_BITS) + " variables")
+
+def minimize_request(request, form: str = 'SOP', method: str = 'exact', timeout: float = None,
+                     cache: MinimizationCache = None) -> dict:
+    """
+    Minimizes one batch request and turns any failure into an error result.
+    A request looks like {"on": [...], "dc": [...], "bits": 4, "form": "SOP"};
+    only "on" is required; "method", "engine", "limit", "first_only", "cost" and
+    "verify" may also be given, an "id" field is copied to the result, and "stats": true adds the
+    solver's instrumentation to it. A request with "outputs": [{"on": ..., "dc": ...}, ...]
+    instead of "on" is minimized with shared products by minimize_multi.
+    At most MAX_REQUEST_BITS variables are accepted (see check_request_bits).
+    The timeout uses SIGALRM, so it is only enforced on the main thread of a
+    platform that has it (the main thread of each pool worker on Unix).
+
+    Args:
+        request: Request dictionary or a JSON line holding one
+        form: Default form for requests without one
+        method: Default method for requests without one
+        timeout: Seconds before the request is abandoned (None for no limit)
+        cache: Cache to reuse earlier results from (defaults to this worker's cache)
+    Returns:
+        Result dictionary from minimize, or {"error": ...}
+    """
+    if cache is None:
+        cache = worker_cache
+
+    use_timer = (timeout is not None and hasattr(signal, 'setitimer')
+                 and threading.current_thread() is threading.main_thread())
+    if use_timer:
+        previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        if isinstance(request, str):
+            request = json.loads(request)
+        if not isinstance(request, dict):
+            raise TypeError("Request must be a JSON object")
+        check_request_bits(request)
+        if 'outputs' in request:
+            outputs = request['outputs']
+            result = minimize_multi([output['on'] for output in outputs], [output.get('dc', ()) for output in outputs],
+                                    request.get('form', form), request.get('bits'))
+        else:
+            stats = {} if request.get('stats') else None
+            result = minimize(request['on'], request.get('dc', ()), request.get('form', form),
+                              request.get('bits'), request.get('method', method), cache,
+                              request.get('engine', 'auto'), stats, request.get('limit'),
+                              request.get('first_only', False), request.get('cost'),
+                              request.get('verify', False))
+            if stats is not None:
+                result['stats'] = stats
+    except TimeoutError as error:
+        result = {'error': str(error)}
+    except (ValueError, KeyError, TypeError, ImportError) as error:
+        result = {'error': str(error)}
+    except (OverflowError, MemoryError) as error:
+        result = {'error': 'Function too large: ' + (str(error) or type(error).__name__)}
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    if isinstance(request, dict) and 'id' in request:
+        result['id'] = request['id']
+    return result
+
+def minimize_batch(requests, form: str = 'SOP', method: str = 'exact', workers: int = 1,
+                   chunksize: int = 64, timeout: float = None, cache: MinimizationCache = None):
+    """
+    Minimizes many independent requests, optionally spread over a process pool.
+    Requests are sent to the workers in chunks to keep pickling overhead down, and
+    the input is read one window of chunks at a time so long streams are not loaded
+    up front. Results come back in input order.
+
+    Args:
+        requests: Iterable of request dictionaries or JSON lines
+        form: Default form for requests without one
+        method: Default method for requests without one
+        workers: Number of worker processes (1 runs in this process, None uses every core)
+        chunksize: Number of requests sent to a worker at a time
+        timeout: Seconds before a single request is abandoned (None for no limit)
+        cache: Cache to use in this process. Pool workers each get an in-memory
+            cache with the same size and npn setting instead
+    Returns:
+        Generator of result dictionaries
+    """
+    if workers == 1:
+        for request in requests:
+            yield minimize_request(request, form, method, timeout, cache)
+        return
+
+    solve = functools.partial(minimize_request, form=form, method=method, timeout=timeout)
+    initializer = None
+    initargs = ()
+    if cache is not None:
+        initializer = start_worker_cache
+        initargs = (cache.maxsize, cache.npn)
+
+    requests = iter(requests)
+    window = chunksize * (workers or os.cpu_count() or 1) * 4
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as executor:
+        while True:
+            batch = list(itertools.islice(requests, window))
+            if not batch:
+                break
+            yield from executor.map(solve, batch, chunksize=chunksize)
+
+def minimize_stream(lines, output, form: str = 'SOP', method: str = 'exact', workers: int = 1,
+                    chunksize: int = 64, timeout: float = None, cache: MinimizationCache = None) -> None:
+    """
+    Minimizes one JSON function per line and writes one JSON result per line.
+    Blank lines are skipped; bad lines produce an {"error": ...} result instead
+    of stopping the stream.
+
+    Args:
+        lines: Iterable of JSON lines
+        output: Text stream the results are written to
+        form: Default form for lines without one
+        method: Default method for lines without one
+        workers: Number of worker processes (see minimize_batch)
+        chunksize: Number of lines sent to a worker at a time
+        timeout: Seconds before a single line is abandoned
+        cache: Result cache (see minimize_batch)
+    """
+    requests = (line for line in lines if line.strip())
+    for result in minimize_batch(requests, form, method, workers, chunksize, timeout, cache):
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+def minimize_file(path: str, file_format: str, output, form: str = 'SOP', method: str = 'exact') -> None:
+    """
+    Minimizes a PLA or hex truth table file and writes the result as a PLA.
+    A PLA with several outputs is minimized with shared products.
+
+    Args:
+        path: File to read
+        file_format: 'pla' or 'hex'
+        output: Text stream the PLA is written to
+        form: 'SOP' or 'POS'
+        method: 'exact' or 'heuristic' (single output only)
+    """
+    if file_format == 'pla':
+        pla = read_pla(path)
+        input_names, output_names = pla['input_names'], pla['output_names']
+        tables = pla['tables']
+    else:
+        input_names, output_names = None, None
+        tables = [read_hex_table(path)]
+
+    if len(tables) == 1:
+        result = minimize_table(tables[0], form, method, first_only=True)
+    else:
+        result = minimize_multi_table(tables, form)
+    write_pla(output, result, input_names, output_names)
+
+def run_interactive() -> None:
+    kmap_size = request_kmap_size()
+    analysis_type = request_analysis_type()
+    solver_type = request_solver_type()
+    input_type = request_input_type()
+    if input_type == 1:
+        table = request_kmap_input(kmap_size)
+    else:
+        table = request_binary_input(kmap_size)
+    print("Inputted KMAP!")
+    print_kmap(table)
+    input()
+
+    if analysis_type == 2:
+        print("Flipped KMAP!")
+        print_kmap(table.complement())
+        input()
+
+    result = minimize_table(table, 'POS' if analysis_type == 2 else 'SOP',
+                            'heuristic' if solver_type == 2 else 'exact')
+    if solver_type == 2:
+        print("Proven minimal!" if result['proven_minimal'] else "Not proven minimal")
+
+    for expression in result['expressions']:
+        print(expression)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="K-map / Quine-McCluskey minimizer")
+    parser.add_argument('--batch', metavar='FILE', help="minimize JSON lines from FILE ('-' for stdin)")
+    parser.add_argument('--pla', metavar='FILE', help="minimize a Berkeley PLA file and write the result as a PLA")
+    parser.add_argument('--hex', metavar='FILE', help="minimize a hex truth table file and write the result as a PLA")
+    parser.add_argument('--output', metavar='FILE', help="write results to FILE instead of stdout")
+    parser.add_argument('--form', choices=['SOP', 'POS'], default='SOP', help="default form for batch lines and files")
+    parser.add_argument('--method', choices=['exact', 'heuristic'], default='exact', help="default method for batch lines and files")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes for batch mode (0 = every core)")
+    parser.add_argument('--chunksize', type=int, default=64, help="lines sent to a worker at a time")
+    parser.add_argument('--timeout', type=float, help="seconds before a single function is abandoned")
+    parser.add_argument('--cache-size', type=int, default=0, help="results kept in the LRU cache (0 = no cache)")
+    parser.add_argument('--cache-file', metavar='FILE', help="persistent cache store (single worker only)")
+    parser.add_argument('--npn', action='store_true', help="share cache entries between functions equal up to input permutation/negation")
+    args = parser.parse_args(argv)
+
+    if args.pla or args.hex:
+        output = sys.stdout if args.output is None else open(args.output, 'w')
+        try:
+            minimize_file(args.pla or args.hex, 'pla' if args.pla else 'hex', output, args.form, args.method)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return
+
+    if args.batch is None:
+        run_interactive()
+        return
+
+    cache = None
+    if args.cache_size > 0 or args.cache_file:
+        cache = MinimizationCache(max(args.cache_size, 1), args.npn, args.cache_file if args.workers == 1 else None)
+
+    lines = sys.stdin if args.batch == '-' else open(args.batch)
+    output = sys.stdout if args.output is None else open(args.output, 'w')
+    try:
+        minimize_stream(lines, output, args.form, args.method, args.workers or None,
+                        args.chunksize, args.timeout, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+        if lines is not sys.stdin:
+            lines.close()
+        if output is not sys.stdout:
+            output.close()
 
-    print(result)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
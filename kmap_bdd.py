@@ -0,0 +1,441 @@
+class BDD:
+    """
+    Reduced ordered binary decision diagram manager with a unique table and computed cache.
+    Variable 0 (A) is tested first and is the most significant bit of a minterm number,
+    as in kmap.py.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        # Terminals sit below every variable
+        self.var = [bits, bits]
+        self.low = [0, 1]
+        self.high = [0, 1]
+        self.unique = {}
+        self.and_cache = {}
+
+    def node(self, var: int, low: int, high: int) -> int:
+        """ The node for 'if var then high else low', shared and reduced """
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.var)
+            self.var.append(var)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def conjoin(self, f: int, g: int) -> int:
+        """ The node for f AND g """
+        if f == self.FALSE or g == self.FALSE:
+            return self.FALSE
+        if f == self.TRUE or f == g:
+            return g
+        if g == self.TRUE:
+            return f
+        if f > g:
+            f, g = g, f
+        result = self.and_cache.get((f, g))
+        if result is not None:
+            return result
+
+        var = min(self.var[f], self.var[g])
+        f0, f1 = (self.low[f], self.high[f]) if self.var[f] == var else (f, f)
+        g0, g1 = (self.low[g], self.high[g]) if self.var[g] == var else (g, g)
+        result = self.node(var, self.conjoin(f0, g0), self.conjoin(f1, g1))
+        self.and_cache[(f, g)] = result
+        return result
+
+    def from_bitset(self, bitset: int) -> int:
+        """
+        Builds the BDD of a function from its packed truth table.
+
+        Args:
+            bitset: Bitset where bit i is set when minterm i is true
+        Returns:
+            Root node of the function
+        """
+        built = {}
+
+        def build(var: int, chunk: int) -> int:
+            # chunk is the truth table of the function with variables before var fixed
+            if chunk == 0:
+                return self.FALSE
+            size = 1 << (self.bits - var)
+            if chunk == (1 << size) - 1:
+                return self.TRUE
+            node = built.get((var, chunk))
+            if node is None:
+                half = size >> 1
+                node = self.node(var, build(var + 1, chunk & ((1 << half) - 1)), build(var + 1, chunk >> half))
+                built[(var, chunk)] = node
+            return node
+
+        return build(0, bitset)
+
+class ZDD:
+    """ Zero-suppressed decision diagram manager for sets of cubes """
+
+    EMPTY = 0  # No cubes
+    BASE = 1   # Only the cube with no literals
+
+    def __init__(self):
+        # Terminals sit below every variable
+        self.var = [float('inf'), float('inf')]
+        self.low = [0, 1]
+        self.high = [0, 1]
+        self.unique = {}
+        self.union_cache = {}
+        self.difference_cache = {}
+
+    def node(self, var: int, low: int, high: int) -> int:
+        """ The node for 'cubes of low, plus cubes of high with var added', shared and reduced """
+        if high == self.EMPTY:
+            return low
+        key = (var, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.var)
+            self.var.append(var)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def union(self, p: int, q: int) -> int:
+        """ Cubes in p or q """
+        if p == self.EMPTY or p == q:
+            return q
+        if q == self.EMPTY:
+            return p
+        if p > q:
+            p, q = q, p
+        result = self.union_cache.get((p, q))
+        if result is not None:
+            return result
+
+        if self.var[p] < self.var[q]:
+            result = self.node(self.var[p], self.union(self.low[p], q), self.high[p])
+        elif self.var[p] > self.var[q]:
+            result = self.node(self.var[q], self.union(p, self.low[q]), self.high[q])
+        else:
+            result = self.node(self.var[p], self.union(self.low[p], self.low[q]), self.union(self.high[p], self.high[q]))
+        self.union_cache[(p, q)] = result
+        return result
+
+    def difference(self, p: int, q: int) -> int:
+        """ Cubes in p but not in q """
+        if p == self.EMPTY or p == q:
+            return self.EMPTY
+        if q == self.EMPTY:
+            return p
+        result = self.difference_cache.get((p, q))
+        if result is not None:
+            return result
+
+        if self.var[p] < self.var[q]:
+            result = self.node(self.var[p], self.difference(self.low[p], q), self.high[p])
+        elif self.var[p] > self.var[q]:
+            result = self.difference(p, self.low[q])
+        else:
+            result = self.node(self.var[p], self.difference(self.low[p], self.low[q]),
+                               self.difference(self.high[p], self.high[q]))
+        self.difference_cache[(p, q)] = result
+        return result
+
+    def cubes(self, root: int):
+        """
+        Yields every cube of a set as the list of its ZDD variables.
+
+        Args:
+            root: Root node of the set
+        Yields:
+            Lists of variables, smallest first
+        """
+        stack = [(root, [])]
+        while stack:
+            node, literals = stack.pop()
+            if node == self.EMPTY:
+                continue
+            if node == self.BASE:
+                yield literals
+                continue
+            stack.append((self.low[node], literals))
+            stack.append((self.high[node], literals + [self.var[node]]))
+
+def get_prime_implicant_zdd(bdd: BDD, zdd: ZDD, f: int) -> int:
+    """
+    Computes the prime implicants of a function as a ZDD (Coudert-Madre).
+    Input variable i is ZDD variable 2i as a plain literal and 2i + 1 as a complemented one.
+    With x the top variable of f:
+    Prime(f) = Prime(f0.f1) + x'.(Prime(f0) - Prime(f0.f1)) + x.(Prime(f1) - Prime(f0.f1))
+
+    Args:
+        bdd: Manager holding f
+        zdd: Manager to build the primes in
+        f: Root node of the function
+    Returns:
+        Root node of the set of prime implicants
+    """
+    primes = {BDD.FALSE: ZDD.EMPTY, BDD.TRUE: ZDD.BASE}
+
+    def prime(f: int) -> int:
+        result = primes.get(f)
+        if result is None:
+            var, f0, f1 = bdd.var[f], bdd.low[f], bdd.high[f]
+            shared = prime(bdd.conjoin(f0, f1))
+            negative = zdd.difference(prime(f0), shared)
+            positive = zdd.difference(prime(f1), shared)
+            result = zdd.node(2 * var, zdd.node(2 * var + 1, shared, negative), positive)
+            primes[f] = result
+        return result
+
+    return prime(f)
+
+def iter_prime_implicant_pairs(zdd: ZDD, root: int, bits: int):
+    """
+    Yields the cubes of a prime implicant ZDD as (value, mask) pairs.
+
+    Args:
+        zdd: Manager holding the primes
+        root: Root node of the primes
+        bits: Number of variables
+    Yields:
+        (value, mask) pairs, where a mask bit marks a dash
+    """
+    full = (1 << bits) - 1
+    for literals in zdd.cubes(root):
+        value = 0
+        mask = full
+        for literal in literals:
+            bit = 1 << (bits - 1 - (literal >> 1))
+            mask &= ~bit
+            if not literal & 1:
+                value |= bit
+        yield value, mask
+
+def split_cubes(zdd: ZDD, node: int, var: int) -> tuple[int, int, int]:
+    """
+    Splits a set of cubes over input variables var and later by how they use input var.
+
+    Args:
+        zdd: Manager holding the cubes
+        node: Root node of the set
+        var: Input variable (ZDD variables 2var and 2var + 1)
+    Returns:
+        Tuple of the cubes without var, those with var plain and those with var
+        complemented (the last two without that literal)
+    """
+    plain = complemented = ZDD.EMPTY
+    if zdd.var[node] == 2 * var:
+        plain = zdd.high[node]
+        node = zdd.low[node]
+    if zdd.var[node] == 2 * var + 1:
+        complemented = zdd.high[node]
+        node = zdd.low[node]
+    return node, plain, complemented
+
+def get_cover_counts(zdd: ZDD, root: int, bits: int) -> tuple[int, int]:
+    """
+    Finds which minterms a set of cubes covers at least once and at least twice,
+    without listing the cubes. Each half of the truth table of a subspace is covered
+    by the cubes without its top variable plus those with the matching literal, so
+    the counts are built bottom-up as bitsets, once per node and variable.
+
+    Args:
+        zdd: Manager holding the cubes
+        root: Root node of the set
+        bits: Number of variables
+    Returns:
+        Tuple of bitsets of minterms covered by at least one and by at least two cubes
+    """
+    counts = {}
+
+    def count(node: int, var: int) -> tuple[int, int]:
+        if node == ZDD.EMPTY:
+            return 0, 0
+        size = 1 << (bits - var)
+        if node == ZDD.BASE:
+            return (1 << size) - 1, 0
+        result = counts.get((node, var))
+        if result is None:
+            rest, plain, complemented = split_cubes(zdd, node, var)
+            rest_once, rest_twice = count(rest, var + 1)
+            plain_once, plain_twice = count(plain, var + 1)
+            complemented_once, complemented_twice = count(complemented, var + 1)
+            # var is the most significant bit of the subspace: its 0 half comes first
+            half = size >> 1
+            once = (rest_once | complemented_once) | (rest_once | plain_once) << half
+            twice = ((rest_twice | complemented_twice | (rest_once & complemented_once))
+                     | (rest_twice | plain_twice | (rest_once & plain_once)) << half)
+            result = (once, twice)
+            counts[(node, var)] = result
+        return result
+
+    return count(root, 0)
+
+def find_covering_cube(zdd: ZDD, root: int, bits: int, minterm: int) -> list[int]:
+    """
+    Finds a cube of a set that covers a minterm.
+
+    Args:
+        zdd: Manager holding the cubes
+        root: Root node of the set
+        bits: Number of variables
+        minterm: Minterm number to cover
+    Returns:
+        List of ZDD variables of the cube, or None if no cube covers the minterm
+    """
+    failed = set()
+
+    def find(node: int):
+        if node == ZDD.BASE:
+            return []
+        if node == ZDD.EMPTY or node in failed:
+            return None
+        literal = zdd.var[node]
+        if (minterm >> (bits - 1 - (literal >> 1))) & 1 != literal & 1:
+            literals = find(zdd.high[node])
+            if literals is not None:
+                return [literal] + literals
+        literals = find(zdd.low[node])
+        if literals is None:
+            failed.add(node)
+        return literals
+
+    return find(root)
+
+def filter_cubes(zdd: ZDD, root: int, bits: int, minterms: int) -> int:
+    """
+    Keeps the cubes of a set that cover at least one of some minterms.
+
+    Args:
+        zdd: Manager holding the cubes
+        root: Root node of the set
+        bits: Number of variables
+        minterms: Bitset of the minterms
+    Returns:
+        Root node of the cubes covering one of them
+    """
+    filtered = {}
+
+    def keep(node: int, var: int, chunk: int) -> int:
+        # chunk is the bitset of the minterms in the subspace below the variables fixed so far
+        if node == ZDD.EMPTY or chunk == 0:
+            return ZDD.EMPTY
+        if node == ZDD.BASE:
+            return ZDD.BASE
+        result = filtered.get((node, var, chunk))
+        if result is None:
+            half = 1 << (bits - var - 1)
+            low_half = chunk & ((1 << half) - 1)
+            high_half = chunk >> half
+            rest, plain, complemented = split_cubes(zdd, node, var)
+            result = zdd.node(2 * var, zdd.node(2 * var + 1, keep(rest, var + 1, low_half | high_half),
+                                                keep(complemented, var + 1, low_half)),
+                              keep(plain, var + 1, high_half))
+            filtered[(node, var, chunk)] = result
+        return result
+
+    return keep(root, 0, minterms)
+
+def count_cubes(zdd: ZDD, root: int) -> int:
+    """ Number of cubes in a set """
+    counts = {ZDD.EMPTY: 0, ZDD.BASE: 1}
+
+    def count(node: int) -> int:
+        result = counts.get(node)
+        if result is None:
+            result = count(zdd.low[node]) + count(zdd.high[node])
+            counts[node] = result
+        return result
+
+    return count(root)
+
+def get_cube_minterms(value: int, mask: int) -> int:
+    """ Bitset of the minterms of a (value, mask) cube """
+    minterms = 1 << value
+    while mask:
+        bit = mask & -mask
+        minterms |= minterms << bit
+        mask ^= bit
+    return minterms
+
+def get_prime_implicant_pairs_bdd(bits: int, care: int, stats: dict = None) -> list[tuple[int, int]]:
+    """
+    Finds all prime implicants of a function through its BDD and a prime implicant ZDD.
+    The primes are generated implicitly, which skips the merged terms that tabulation
+    runs out of memory on, and then every one of them is listed.
+
+    Args:
+        bits: Number of variables
+        care: Bitset of minterms that may be covered (required or don't care)
+        stats: Dictionary to record 'bdd_nodes' and 'zdd_nodes' in (None to skip)
+    Returns:
+        List of prime implicants as (value, mask) pairs, in the same order as
+        kmap.get_prime_implicant_pairs
+    """
+    bdd = BDD(bits)
+    zdd = ZDD()
+    root = get_prime_implicant_zdd(bdd, zdd, bdd.from_bitset(care))
+    if stats is not None:
+        stats['bdd_nodes'] = len(bdd.var)
+        stats['zdd_nodes'] = len(zdd.var)
+    return sorted(iter_prime_implicant_pairs(zdd, root, bits), key=lambda implicant: (implicant[1], implicant[0]))
+
+def get_cover_prime_implicant_pairs_bdd(bits: int, on: int, care: int, stats: dict = None) -> list[tuple[int, int]]:
+    """
+    Finds the prime implicants a minimum cover can use, without listing the others.
+    The primes stay a ZDD while the essential ones are found: a required minterm that
+    only one prime covers (see get_cover_counts) makes that prime essential. Every
+    prime that covers no required minterm left over by the essential primes is then
+    dropped on the ZDD (see filter_cubes), since a minimum cover never needs it. Only
+    the essential primes and the rest that survive are listed, for the explicit chart
+    to choose between.
+
+    Args:
+        bits: Number of variables
+        on: Bitset of required minterms
+        care: Bitset of minterms that may be covered (required or don't care)
+        stats: Dictionary to record 'bdd_nodes', 'zdd_nodes', all 'zdd_primes' and
+            'essential_primes' in (None to skip)
+    Returns:
+        List of prime implicants as (value, mask) pairs, in the same order as
+        kmap.get_prime_implicant_pairs
+    """
+    bdd = BDD(bits)
+    zdd = ZDD()
+    root = get_prime_implicant_zdd(bdd, zdd, bdd.from_bitset(care))
+
+    once, twice = get_cover_counts(zdd, root, bits)
+    unique = on & once & ~twice
+    essentials = []
+    covered = 0
+    full = (1 << bits) - 1
+    while unique & ~covered:
+        remaining = unique & ~covered
+        minterm = (remaining & -remaining).bit_length() - 1
+        value = 0
+        mask = full
+        for literal in find_covering_cube(zdd, root, bits, minterm):
+            bit = 1 << (bits - 1 - (literal >> 1))
+            mask &= ~bit
+            if not literal & 1:
+                value |= bit
+        essentials.append((value, mask))
+        covered |= get_cube_minterms(value, mask)
+
+    rest = filter_cubes(zdd, root, bits, on & ~covered)
+    if stats is not None:
+        stats['bdd_nodes'] = len(bdd.var)
+        stats['zdd_nodes'] = len(zdd.var)
+        stats['zdd_primes'] = count_cubes(zdd, root)
+        stats['essential_primes'] = len(essentials)
+    return sorted(essentials + list(iter_prime_implicant_pairs(zdd, rest, bits)),
+                  key=lambda implicant: (implicant[1], implicant[0]))
@@ -0,0 +1,195 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import kmap
+import kmap_bdd
+
+
+def random_case(bits: int, density: float, dc_ratio: float, rng: random.Random) -> kmap.TruthTable:
+    """
+    Generates a random function.
+
+    Args:
+        bits: Number of variables
+        density: Chance that a minterm is required
+        dc_ratio: Chance that a minterm that is not required is a don't care
+        rng: Seeded random generator
+    Returns:
+        Truth table of the function
+    """
+    on_set = []
+    dc_set = []
+    for minterm in range(1 << bits):
+        if rng.random() < density:
+            on_set.append(minterm)
+        elif rng.random() < dc_ratio:
+            dc_set.append(minterm)
+    return kmap.TruthTable.from_indices(bits, on_set, dc_set)
+
+def parity_case(bits: int) -> kmap.TruthTable:
+    # Odd parity: no two minterms merge, so every minterm is its own prime
+    return kmap.TruthTable.from_indices(bits, [m for m in range(1 << bits) if m.bit_count() % 2])
+
+def cyclic_case(bits: int) -> kmap.TruthTable:
+    # Everything except all zeros and all ones: no essential primes, many equal covers
+    return kmap.TruthTable.from_indices(bits, range(1, (1 << bits) - 1))
+
+def generate_cases(bits_list: list[int], densities: list[float], dc_ratios: list[float],
+                   seed: int, samples: int) -> list[tuple[str, dict, kmap.TruthTable]]:
+    """
+    Builds the benchmark cases. The same arguments always give the same cases.
+
+    Returns:
+        List of (name, parameters, truth table)
+    """
+    cases = []
+    for bits in bits_list:
+        for density in densities:
+            for dc_ratio in dc_ratios:
+                # Each parameter set gets its own generator so adding one doesn't shift the others
+                rng = random.Random(str(seed) + ':' + str(bits) + ':' + str(density) + ':' + str(dc_ratio))
+                for sample in range(samples):
+                    name = 'random-b' + str(bits) + '-d' + str(density) + '-x' + str(dc_ratio) + '-s' + str(sample)
+                    parameters = {'kind': 'random', 'bits': bits, 'density': density, 'dc_ratio': dc_ratio}
+                    cases.append((name, parameters, random_case(bits, density, dc_ratio, rng)))
+        cases.append(('parity-b' + str(bits), {'kind': 'parity', 'bits': bits}, parity_case(bits)))
+        cases.append(('cyclic-b' + str(bits), {'kind': 'cyclic', 'bits': bits}, cyclic_case(bits)))
+    return cases
+
+def run_pipeline(table: kmap.TruthTable, stages: dict, engine: str) -> dict:
+    """
+    Runs each pipeline stage once, adding its wall time to stages.
+
+    Returns:
+        Dictionary of result sizes (primes, cover size, heuristic cover size)
+    """
+    required = table.minterms()
+
+    start = time.perf_counter()
+    if engine == 'bdd':
+        prime_implicants = kmap_bdd.get_prime_implicant_pairs_bdd(table.bits, table.care())
+    elif kmap.use_dense_engine(table, engine):
+        prime_implicants = kmap.get_prime_implicant_pairs_dense(table)
+    else:
+        care = kmap.bitset_to_indices(table.care())
+        prime_implicants = kmap.get_prime_implicant_pairs([(minterm, 0) for minterm in care], table.bits)
+    stages['primes'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = kmap.get_implicant_coverage(prime_implicants, required)
+    stages['chart'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cover = kmap.find_minimum_cover(rows, (1 << len(required)) - 1)
+    stages['cover'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    heuristic_cover, _ = kmap.espresso_pairs(set(required), set(table.dont_cares()), table.bits)
+    stages['heuristic'] = time.perf_counter() - start
+
+    return {
+        'primes': len(prime_implicants),
+        'columns': len(required),
+        'cover_size': len(cover),
+        'heuristic_size': len(heuristic_cover)
+    }
+
+def benchmark_case(table: kmap.TruthTable, repeat: int, engine: str) -> dict:
+    """
+    Times every stage (best of repeat runs), then measures peak memory in one extra
+    run, since tracemalloc slows the code it watches.
+    """
+    best = {}
+    for _ in range(repeat):
+        stages = {}
+        sizes = run_pipeline(table, stages, engine)
+        for stage, seconds in stages.items():
+            best[stage] = min(seconds, best.get(stage, seconds))
+
+    tracemalloc.start()
+    run_pipeline(table, {}, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {'stages': best, 'total': sum(best.values()), 'peak_memory': peak}
+    result.update(sizes)
+    return result
+
+def compare_to_baseline(results: list[dict], baseline: dict, threshold: float, min_time: float) -> list[str]:
+    """
+    Prints the time ratio of every case against a saved run.
+    Cases faster than min_time in both runs are too noisy to flag.
+
+    Returns:
+        Names of the cases whose total time grew by more than threshold
+    """
+    baseline_cases = {case['name']: case for case in baseline['results']}
+    regressions = []
+    print("%-32s %10s %10s %7s" % ('case', 'baseline', 'current', 'ratio'))
+    for case in results:
+        old = baseline_cases.get(case['name'])
+        if old is None:
+            continue
+        ratio = case['total'] / old['total'] if old['total'] else float('inf')
+        flag = ''
+        if ratio > threshold and max(case['total'], old['total']) >= min_time:
+            regressions.append(case['name'])
+            flag = ' REGRESSION'
+        print("%-32s %9.4fs %9.4fs %6.2fx%s" % (case['name'], old['total'], case['total'], ratio, flag))
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the kmap.py minimization pipeline")
+    parser.add_argument('--bits', type=int, nargs='+', default=[4, 5, 6, 7], help="variable counts")
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.25, 0.5, 0.75], help="on-set densities")
+    parser.add_argument('--dc-ratios', type=float, nargs='+', default=[0.0, 0.2], help="don't care ratios")
+    parser.add_argument('--samples', type=int, default=3, help="random functions per parameter set")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument('--engine', choices=['auto', 'python', 'numpy', 'bdd'], default='python')
+    parser.add_argument('--output', metavar='FILE', help="write JSON results to FILE")
+    parser.add_argument('--baseline', metavar='FILE', help="compare against JSON results saved earlier")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    parser.add_argument('--min-time', type=float, default=0.005, help="cases faster than this (seconds) are never flagged")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, parameters, table in generate_cases(args.bits, args.densities, args.dc_ratios, args.seed, args.samples):
+        result = {'name': name}
+        result.update(parameters)
+        result.update(benchmark_case(table, args.repeat, args.engine))
+        results.append(result)
+        stages = ' '.join(stage + '=%.4fs' % seconds for stage, seconds in result['stages'].items())
+        print("%-32s primes=%-5d cover=%-4d %s peak=%dKiB" % (name, result['primes'], result['cover_size'],
+                                                              stages, result['peak_memory'] // 1024))
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'engine': args.engine,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_to_baseline(results, json.load(baseline_file), args.threshold, args.min_time)
+        if regressions:
+            print(str(len(regressions)) + " regression(s)")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import stat
+import time
+
+import kmap
+
+
+def solve_request(request: dict, form: str, method: str, timeout: float) -> dict:
+    # Anything minimize_request lets through fails this request only, not its whole batch
+    try:
+        return kmap.minimize_request(request, form, method, timeout)
+    except Exception as error:
+        result = {'error': "Request failed: " + (str(error) or type(error).__name__)}
+        if 'id' in request:
+            result['id'] = request['id']
+        return result
+
+def solve_requests(requests: list[dict], form: str, method: str, timeout: float) -> list[dict]:
+    # Runs in a pool worker: one call per batch, so a batch costs one round trip
+    return [solve_request(request, form, method, timeout) for request in requests]
+
+class MinimizationServer:
+    """
+    Resident minimizer answering newline-delimited JSON requests on a Unix socket.
+    Each line is a minimize_request request; the response to it is one JSON line,
+    in the order the connection sent them. {"op": "health"} and {"op": "stats"}
+    report on the server instead. Requests from every client are gathered into
+    batches for a process pool, and results are kept in one cache shared by all
+    clients; a request equal to one still being solved waits for that one's result
+    instead of being queued again. So the interpreter and pool start-up are only paid once. A pool broken
+    by a dying worker is replaced with a new one.
+    """
+
+    def __init__(self, path: str, workers: int = None, batch_size: int = 32, batch_delay: float = 0.002,
+                 form: str = 'SOP', method: str = 'exact', timeout: float = None,
+                 cache_size: int = 1024, npn: bool = False):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.form = form
+        self.method = method
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.npn = npn
+
+        # Whole results by request; the workers also keep their own table caches
+        self.cache = kmap.MinimizationCache(cache_size) if cache_size > 0 else None
+        # Requests waiting on an equal request being solved, by cache key
+        self.pending = {}
+        self.queue = None
+        self.executor = None
+        self.server = None
+        self.dispatcher = None
+        self.batches = set()
+        self.started = time.monotonic()
+        self.counters = {
+            'requests': 0,
+            'completed': 0,
+            'errors': 0,
+            'cache_hits': 0,
+            'merged': 0,
+            'batches': 0,
+            'batched_requests': 0,
+            'pool_restarts': 0,
+            'latency': 0.0
+        }
+
+    async def start(self) -> None:
+        """ Start the worker pool and listen on the socket (a stale socket file is replaced) """
+        if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            os.unlink(self.path)
+
+        self.start_pool()
+        # Start the workers now, so the first batch does not pay for it
+        await asyncio.get_running_loop().run_in_executor(self.executor, int)
+
+        self.queue = asyncio.Queue()
+        self.started = time.monotonic()
+        self.dispatcher = asyncio.create_task(self.dispatch())
+        self.server = await asyncio.start_unix_server(self.handle_client, path=self.path, limit=1 << 24)
+
+    def start_pool(self) -> None:
+        """
+        Creates the worker pool. Workers come from a fork server where the platform has
+        one: forked from this process, they would inherit open client sockets and keep
+        those connections from closing, which matters once a pool is replaced while
+        clients are connected.
+        """
+        initializer = None
+        initargs = ()
+        if self.cache_size > 0:
+            initializer = kmap.start_worker_cache
+            initargs = (self.cache_size, self.npn)
+        context = None
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        self.executor = concurrent.futures.ProcessPoolExecutor(self.workers, mp_context=context,
+                                                               initializer=initializer, initargs=initargs)
+
+    def restart_pool(self, broken: concurrent.futures.Executor) -> None:
+        """ Replaces a broken pool, unless another batch already replaced it """
+        if self.executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.start_pool()
+        self.counters['pool_restarts'] += 1
+
+    async def close(self) -> None:
+        """ Stop listening, cancel the dispatcher and shut the pool down """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def health(self) -> dict:
+        return {
+            'status': 'ok',
+            'uptime': time.monotonic() - self.started,
+            'workers': self.workers,
+            'queued': self.queue.qsize(),
+            'pool_restarts': self.counters['pool_restarts']
+        }
+
+    def stats(self) -> dict:
+        """
+        Request counts, throughput, mean latency and batching and cache effectiveness.
+        'cache_hits' counts every request answered without being solved, 'merged' the
+        ones among them that waited on an equal request in flight.
+        """
+        counters = self.counters
+        uptime = time.monotonic() - self.started
+        completed = counters['completed']
+        batches = counters['batches']
+        return {
+            'uptime': uptime,
+            'requests': counters['requests'],
+            'completed': completed,
+            'errors': counters['errors'],
+            'in_flight': counters['requests'] - completed,
+            'queued': self.queue.qsize(),
+            'throughput': completed / uptime if uptime else 0.0,
+            'mean_latency': counters['latency'] / completed if completed else 0.0,
+            'batches': batches,
+            'mean_batch_size': counters['batched_requests'] / batches if batches else 0.0,
+            'cache_hits': counters['cache_hits'],
+            'merged': counters['merged'],
+            'pool_restarts': counters['pool_restarts'],
+            'cache_size': len(self.cache.entries) if self.cache is not None else 0
+        }
+
+    def cache_key(self, request: dict) -> str:
+        """ Cache key for a request, or None if its result must not be shared """
+        if self.cache is None or request.get('stats'):
+            return None
+        return json.dumps({key: value for key, value in request.items() if key != 'id'}, sort_keys=True)
+
+    def finish(self, future: asyncio.Future, result: dict, started: float) -> None:
+        """ Record a finished request and hand its result to the waiting connection """
+        self.counters['completed'] += 1
+        self.counters['latency'] += time.monotonic() - started
+        if 'error' in result:
+            self.counters['errors'] += 1
+        future.set_result(result)
+
+    def submit(self, line: str) -> asyncio.Future:
+        """
+        Answers a request line from the cache, attaches it to an equal request in
+        flight, or queues it for the next batch.
+
+        Args:
+            line: JSON request line
+        Returns:
+            Future resolving to the response dictionary
+        """
+        future = asyncio.get_running_loop().create_future()
+        started = time.monotonic()
+        self.counters['requests'] += 1
+
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            self.finish(future, {'error': str(error)}, started)
+            return future
+        if not isinstance(request, dict):
+            self.finish(future, {'error': "Invalid request. Must be a JSON object"}, started)
+            return future
+
+        op = request.get('op')
+        if op is not None:
+            if op == 'health':
+                result = self.health()
+            elif op == 'stats':
+                result = self.stats()
+            else:
+                result = {'error': "Invalid op. Must be 'health' or 'stats'"}
+            if 'id' in request:
+                result['id'] = request['id']
+            self.finish(future, result, started)
+            return future
+
+        key = self.cache_key(request)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.counters['cache_hits'] += 1
+                result = dict(cached)
+                if 'id' in request:
+                    result['id'] = request['id']
+                self.finish(future, result, started)
+                return future
+            if key in self.pending:
+                self.counters['cache_hits'] += 1
+                self.counters['merged'] += 1
+                self.pending[key].append((request, future, started))
+                return future
+            self.pending[key] = []
+
+        self.queue.put_nowait((request, key, future, started))
+        return future
+
+    async def dispatch(self) -> None:
+        """ Gathers queued requests into batches of up to batch_size, waiting at most batch_delay """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Keep a reference until the batch is done, or the task could be collected
+            task = asyncio.create_task(self.run_batch(batch))
+            self.batches.add(task)
+            task.add_done_callback(self.batches.discard)
+
+    async def run_batch(self, batch: list[tuple]) -> None:
+        """ Solves one batch in the pool and resolves its futures """
+        self.counters['batches'] += 1
+        self.counters['batched_requests'] += len(batch)
+        requests = [request for request, _, _, _ in batch]
+        executor = self.executor
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                executor, solve_requests, requests, self.form, self.method, self.timeout)
+        except concurrent.futures.process.BrokenProcessPool as error:
+            results = [{'error': "Worker pool failed: " + str(error)} for _ in batch]
+            self.restart_pool(executor)
+        except Exception as error:
+            # Every future of the batch must still be resolved, or its connection waits forever
+            results = [{'error': "Batch failed: " + (str(error) or type(error).__name__)} for _ in batch]
+
+        for (request, key, future, started), result in zip(batch, results):
+            self.finish(future, result, started)
+            if key is None:
+                continue
+            shared = {name: value for name, value in result.items() if name != 'id'}
+            if 'error' not in result:
+                self.cache.put(key, shared)
+            for waiting_request, waiting_future, waiting_started in self.pending.pop(key, []):
+                waiting_result = dict(shared)
+                if 'id' in waiting_request:
+                    waiting_result['id'] = waiting_request['id']
+                self.finish(waiting_future, waiting_result, waiting_started)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Responses go out in request order, while later requests are already being solved
+        responses = asyncio.Queue()
+
+        async def write_responses():
+            while True:
+                future = await responses.get()
+                if future is None:
+                    break
+                writer.write((json.dumps(await future) + "\n").encode())
+                await writer.drain()
+
+        writing = asyncio.create_task(write_responses())
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than the stream limit; the connection cannot be resynchronized
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    responses.put_nowait(self.submit(line.decode()))
+            responses.put_nowait(None)
+            await writing
+        except ConnectionError:
+            writing.cancel()
+        finally:
+            writer.close()
+
+async def serve(server: MinimizationServer) -> None:
+    # Runs until SIGINT or SIGTERM, then removes the socket and stops the pool
+    await server.start()
+    serving = asyncio.create_task(server.server.serve_forever())
+    loop = asyncio.get_running_loop()
+    for signum in [signal.SIGINT, signal.SIGTERM]:
+        loop.add_signal_handler(signum, serving.cancel)
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+def send_requests(path: str, requests: list) -> list[dict]:
+    """
+    Sends requests to a running server and waits for every response.
+
+    Args:
+        path: Socket path of the server
+        requests: Request dictionaries (or {"op": ...} queries)
+    Returns:
+        Response dictionaries in request order
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(''.join(json.dumps(request) + "\n" for request in requests).encode())
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile() as responses:
+            return [json.loads(line) for line in responses]
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Resident K-map minimization server on a Unix socket")
+    parser.add_argument('--socket', required=True, metavar='PATH', help="Unix socket to listen on")
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (0 = every core)")
+    parser.add_argument('--batch-size', type=int, default=32, help="most requests sent to a worker at a time")
+    parser.add_argument('--batch-delay', type=float, default=2.0, help="milliseconds to wait for a batch to fill")
+    parser.add_argument('--form', choices=['SOP', 'POS'], default='SOP', help="default form for requests")
+    parser.add_argument('--method', choices=['exact', 'heuristic'], default='exact', help="default method for requests")
+    parser.add_argument('--timeout', type=float, help="seconds before a single request is abandoned")
+    parser.add_argument('--cache-size', type=int, default=1024, help="results kept in the shared cache (0 = no cache)")
+    parser.add_argument('--npn', action='store_true', help="let worker caches share entries between NPN-equivalent functions")
+    args = parser.parse_args(argv)
+
+    server = MinimizationServer(args.socket, args.workers or None, args.batch_size, args.batch_delay / 1000,
+                                args.form, args.method, args.timeout, args.cache_size, args.npn)
+    asyncio.run(serve(server))
+
+if __name__ == "__main__":
+    main()
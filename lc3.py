@@ -1,14 +1,252 @@
+import argparse
+import array
+import collections
+import os
+import struct
+import sys
+
+TRACE_LEVELS = ['off', 'summary', 'full']
+
+# Binary trace record: address, instruction and condition code before it ran (index into 'NZP')
+TRACE_RECORD = struct.Struct('>HHB')
+
+# Trace records gathered before they are written out
+TRACE_FLUSH_RECORDS = 4096
+
+MEMORY_WORDS = 65536
+
+# Program file formats by extension: object file, text listing or raw memory image
+LOAD_FORMATS = {'.obj': 'obj', '.hex': 'text', '.bin': 'text', '.txt': 'text', '.img': 'image', '.raw': 'image'}
+
+def sign_extend(value, bits):
+    """ Sign-extend the low bits of a field """
+    value &= (1 << bits) - 1
+    if value & (1 << (bits - 1)):
+        value -= 1 << bits
+    return value
+
+def decode_operate(instruction):
+    """ ADD/AND fields: dest, src1, immediate flag and imm5 or src2 """
+    dest = (instruction >> 9) & 0x7  # Destination register
+    src1 = (instruction >> 6) & 0x7  # First source register
+    imm_flag = (instruction >> 5) & 0x1  # Immediate mode flag
+    if imm_flag == 1:
+        operand = sign_extend(instruction, 5)  # 5-bit immediate value
+    else:
+        operand = instruction & 0x7  # Second source register
+    return dest, src1, imm_flag, operand
+
+def decode_not(instruction):
+    """ NOT fields: dest and src """
+    return (instruction >> 9) & 0x7, (instruction >> 6) & 0x7
+
+def decode_pc_offset(instruction):
+    """ LD/ST/LDI/STI/LEA/BR fields: register (or condition codes) and 9-bit PC offset """
+    return (instruction >> 9) & 0x7, sign_extend(instruction, 9)
+
+def decode_base_offset(instruction):
+    """ LDR/STR fields: register, base register and 6-bit offset """
+    return (instruction >> 9) & 0x7, (instruction >> 6) & 0x7, sign_extend(instruction, 6)
+
+def decode_jmp(instruction):
+    """ JMP fields: base register """
+    return ((instruction >> 6) & 0x7,)
+
+def decode_jsr(instruction):
+    """ JSR fields: offset flag and 11-bit offset or base register """
+    use_offset = (instruction >> 11) & 0x1  # Link flag
+    if use_offset:
+        return use_offset, sign_extend(instruction, 11)
+    return use_offset, (instruction >> 6) & 0x7
+
+def decode_trap(instruction):
+    """ TRAP fields: trap vector """
+    return (instruction & 0xFF,)
+
+def decode_unknown(instruction):
+    return (instruction,)
+
+# Handler name and field decoder for each opcode (4 MSB); the rest are unknown
+OPCODES = {
+    0x0: ('BR', decode_pc_offset),
+    0x1: ('ADD', decode_operate),
+    0x2: ('LD', decode_pc_offset),
+    0x3: ('ST', decode_pc_offset),
+    0x4: ('JSR', decode_jsr),
+    0x5: ('AND', decode_operate),
+    0x6: ('LDR', decode_base_offset),
+    0x7: ('STR', decode_base_offset),
+    0x9: ('NOT', decode_not),
+    0xA: ('LDI', decode_pc_offset),
+    0xB: ('STI', decode_pc_offset),
+    0xC: ('JMP', decode_jmp),
+    0xE: ('LEA', decode_pc_offset),
+    0xF: ('TRAP', decode_trap)
+}
+
+def parse_value(text):
+    """ Parse a word written as x3000 (LC-3 hex), #12 (decimal), 0x3000 or 12 """
+    text = text.strip().lower()
+    if text.startswith('x'):
+        return int(text[1:], 16)
+    if text.startswith('#'):
+        return int(text[1:])
+    return int(text, 0)
+
+def read_words(data):
+    """ Unpack big-endian 16-bit words """
+    if len(data) % 2:
+        raise ValueError("Invalid program file. Must hold whole 16-bit words")
+    words = array.array('H')
+    words.frombytes(data)
+    if sys.byteorder == 'little':
+        words.byteswap()
+    return words
+
+def read_text_words(lines):
+    """
+    Read a text listing: one word per line as 4 hex digits (optionally x or 0x
+    prefixed) or 16 binary digits, with ; comments, spaces and _ separators ignored.
+    """
+    words = array.array('H')
+    for number, line in enumerate(lines, 1):
+        word = line.split(';')[0].strip().lower().replace(" ", "").replace("_", "")
+        if not word:
+            continue
+        if word.startswith('0x'):
+            word = word[2:]
+        elif word.startswith('x'):
+            word = word[1:]
+        try:
+            if len(word) == 16:
+                words.append(int(word, 2))
+            elif len(word) == 4:
+                words.append(int(word, 16))
+            else:
+                raise ValueError(word)
+        except ValueError:
+            raise ValueError("Invalid word on line {}. Must be 4 hex or 16 binary digits".format(number)) from None
+    return words
+
+def branch_taken(cond, cc):
+    """ Whether BR condition bits (nzp) match a condition code """
+    return bool((cond & 0x4 and cc == 'N') or
+                (cond & 0x2 and cc == 'Z') or
+                (cond & 0x1 and cc == 'P'))
+
+def disassemble(instruction, pc, cc='Z'):
+    """ Describe an instruction, as run with the PC already incremented to pc and condition code cc """
+    name, decoder = OPCODES.get((instruction >> 12) & 0xF, (None, decode_unknown))
+    operands = decoder(instruction)
+    if name in ['ADD', 'AND']:
+        dest, src1, imm_flag, operand = operands
+        source = "#{:d}".format(operand) if imm_flag == 1 else "R{}".format(operand)
+        return "{} R{} <- R{} {} {}".format(name, dest, src1, '+' if name == 'ADD' else '&', source)
+    if name == 'NOT':
+        return "NOT R{} <- R{}".format(*operands)
+    if name == 'LD':
+        return "LD R{} <- M[{:04X}]".format(operands[0], pc + operands[1])
+    if name == 'ST':
+        return "ST M[{:04X}] <- R{}".format(pc + operands[1], operands[0])
+    if name == 'LDR':
+        return "LDR R{} <- M[R{} + #{:d}]".format(*operands)
+    if name == 'STR':
+        return "STR M[R{1} + #{2:d}] <- R{0}".format(*operands)
+    if name == 'LEA':
+        return "LEA R{} <- {:04X} + #{:d}".format(operands[0], pc, operands[1])
+    if name == 'LDI':
+        return "LDI R{} <- M[M[{:04X} + #{:d}]]".format(operands[0], pc, operands[1])
+    if name == 'STI':
+        return "STI M[M[{:04X} + #{:d}]] <- R{}".format(pc, operands[1], operands[0])
+    if name == 'BR':
+        cond, offset = operands
+        return "BR{:03b} PC <- PC + #{:d}:{}".format(cond, offset, 'T' if branch_taken(cond, cc) else 'F')
+    if name == 'JMP':
+        return "JMP PC <- R{}".format(*operands)
+    if name == 'JSR':
+        use_offset, operand = operands
+        if use_offset:
+            return "JSR PC <- {:04X} + #{:d}".format(pc, operand)
+        return "JSR PC <- R{}".format(operand)
+    if name == 'TRAP':
+        return "TRAP {:04X}".format(*operands)
+    return "Unknown instruction {:04X}".format(instruction)
+
+def format_trace_record(record):
+    """ One trace line, e.g. '3000:1021 ADD R0 <- R0 + #1' """
+    address, instruction, cc = record
+    return "{:04X}:{:04X} {}".format(address, instruction, disassemble(instruction, address + 1, cc))
+
+class Memory(list):
+    """ 16-bit word memory that drops the predecoded instruction of any address written """
+
+    def __init__(self, size):
+        super().__init__([0] * size)
+        self.decoded = {}  # Address -> (handler, operands)
+
+    def __setitem__(self, address, value):
+        super().__setitem__(address, value)
+        if isinstance(address, slice):
+            self.decoded.clear()
+        else:
+            self.decoded.pop(address % len(self), None)
+
 class LC3Simulator:
-    def __init__(self):
+    def __init__(self, trace='full', trace_output=None, trace_size=65536, binary_trace=False):
         # Initialize registers (R0 to R7) and special registers (PC, CC)
         self.registers = [0] * 8  # 8 general-purpose registers
 
-        self.memory = [0] * 65536  # 64K memory (16-bit words)
+        self.memory = Memory(65536)  # 64K memory (16-bit words)
         self.PC = 0x3000
         self.ADDR = 0x3000
         self.CC = 'Z'  # Condition Code (N, Z, P)
         self.running = True
 
+        # Opcode -> (handler, field decoder)
+        self.dispatch = [(self.unknown, decode_unknown)] * 16
+        for opcode, (name, decoder) in OPCODES.items():
+            self.dispatch[opcode] = (getattr(self, name), decoder)
+
+        self.set_trace(trace, trace_output, trace_size, binary_trace)
+
+    def set_trace(self, level, output=None, size=65536, binary=False):
+        """
+        Choose what run() keeps about the instructions it executes.
+        'off' keeps nothing, 'summary' counts instructions by opcode and 'full' also
+        records each one as (address, instruction, condition code). Full records are
+        written to output in blocks of TRACE_FLUSH_RECORDS (as text lines, or packed
+        TRACE_RECORD structs to a binary file when binary is set), or without an output
+        kept in a ring buffer of the last size records.
+        """
+        if level not in TRACE_LEVELS:
+            raise ValueError("Invalid trace level. Must be 'off', 'summary' or 'full'")
+        self.trace_level = level
+        self.trace_output = output
+        self.binary_trace = binary
+        self.trace = collections.deque(maxlen=None if output is not None else size)
+        self.opcode_counts = [0] * 16
+
+    def flush_trace(self):
+        """ Write the buffered trace records to the trace output """
+        if self.trace_output is None or not self.trace:
+            return
+        if self.binary_trace:
+            self.trace_output.write(b''.join(TRACE_RECORD.pack(address, instruction, 'NZP'.index(cc))
+                                             for address, instruction, cc in self.trace))
+        else:
+            self.trace_output.write(''.join(format_trace_record(record) + "\n" for record in self.trace))
+        self.trace.clear()
+
+    def trace_lines(self):
+        """ Text of the records still in the ring buffer, oldest first """
+        return [format_trace_record(record) for record in self.trace]
+
+    def trace_summary(self):
+        """ Instructions executed in total and by opcode """
+        counts = ["{} {}".format(OPCODES.get(opcode, ('???',))[0], count)
+                  for opcode, count in enumerate(self.opcode_counts) if count]
+        return "{} instructions: {}".format(sum(self.opcode_counts), ", ".join(counts))
+
     def load_program(self, program):
         """ Load a list of 16-bit instructions into memory """
         mem_start = int(program[0])
@@ -16,6 +254,72 @@ class LC3Simulator:
         for i in range(1, len(program)):
             self.memory[mem_start + i - 1] = program[i]
 
+    def write_words(self, origin, words):
+        """ Copy a block of words into memory starting at origin """
+        if origin < 0 or origin + len(words) > len(self.memory):
+            raise ValueError("Invalid program. Must fit in memory from x{:04X}".format(origin))
+        self.memory[origin:origin + len(words)] = words
+
+    def load_object(self, path):
+        """ Load an LC-3 object file: big-endian words, the origin first; the PC starts at the origin """
+        with open(path, 'rb') as file:
+            words = read_words(file.read())
+        if not words:
+            raise ValueError("Invalid object file. Must start with an origin")
+        self.write_words(words[0], memoryview(words)[1:])
+        self.PC = words[0]
+
+    def load_text(self, path):
+        """ Load a hex or binary text listing, the origin first; the PC starts at the origin """
+        with open(path) as file:
+            words = read_text_words(file)
+        if not words:
+            raise ValueError("Invalid listing. Must start with an origin")
+        self.write_words(words[0], memoryview(words)[1:])
+        self.PC = words[0]
+
+    def load_image(self, path):
+        """ Replace all of memory with a raw 128 KiB big-endian image, read in one go """
+        words = array.array('H', [0]) * len(self.memory)
+        with open(path, 'rb') as file:
+            size = file.readinto(memoryview(words).cast('B'))
+            if size != 2 * len(words) or file.read(1):
+                raise ValueError("Invalid memory image. Must be exactly {} bytes".format(2 * len(words)))
+        if sys.byteorder == 'little':
+            words.byteswap()
+        self.memory[:] = words
+
+    def load_file(self, path, file_format=None):
+        """
+        Load a program or memory image from a file.
+        file_format is 'obj', 'text' or 'image' (by default taken from the extension, see LOAD_FORMATS).
+        """
+        if file_format is None:
+            file_format = LOAD_FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format == 'obj':
+            self.load_object(path)
+        elif file_format == 'text':
+            self.load_text(path)
+        elif file_format == 'image':
+            self.load_image(path)
+        else:
+            raise ValueError("Invalid file format. Must be 'obj', 'text' or 'image'")
+
+    def set_registers(self, presets):
+        """ Preset registers from a mapping like {'R1': 0x10, 'PC': 0x3000, 'CC': 'P'} """
+        for name, value in presets.items():
+            name = str(name).upper()
+            if name == 'PC':
+                self.PC = value & 0xFFFF
+            elif name == 'CC':
+                if value not in ['N', 'Z', 'P']:
+                    raise ValueError("Invalid condition code. Must be 'N', 'Z' or 'P'")
+                self.CC = value
+            elif name in ['R' + str(i) for i in range(8)]:
+                self.registers[int(name[1])] = value & 0xFFFF
+            else:
+                raise ValueError("Invalid register {}. Must be R0-R7, PC or CC".format(name))
+
     def fetch(self):
         """ Fetch the instruction at the current PC and increment PC """
         # print(f"PC: {self.PC}")
@@ -26,237 +330,112 @@ class LC3Simulator:
         self.PC += 1
         return instruction
 
+    def decode(self, instruction):
+        """ Split an instruction into its handler and decoded operands """
+        handler, decoder = self.dispatch[(instruction >> 12) & 0xF]  # Opcode (4 MSB)
+        return handler, decoder(instruction)
+
+    def predecode(self, address):
+        """ Decoded instruction at an address, kept until that address is written """
+        address %= len(self.memory)
+        decoded = self.memory.decoded.get(address)
+        if decoded is None:
+            decoded = self.decode(self.memory[address])
+            self.memory.decoded[address] = decoded
+        return decoded
+
     def decode_execute(self, instruction):
         """ Decode and execute the instruction """
-        opcode = (instruction >> 12) & 0xF  # Extract the opcode (4 MSB)
-        # print(f"opcode: {opcode:04X}")
-        if opcode == 0x1:  # ADD
-            self.ADD(instruction)
-        elif opcode == 0x5:  # AND
-            self.AND(instruction)
-        elif opcode == 0x9:  # NOT
-            self.NOT(instruction)
-        elif opcode == 0x2:  # LD
-            self.LD(instruction)
-        elif opcode == 0x3:  # ST
-            self.ST(instruction)
-        elif opcode == 0x6:  # LDR
-            self.LDR(instruction)
-        elif opcode == 0x7:  # ST
-            self.STR(instruction)
-        elif opcode == 0xE:  # LEA
-            self.LEA(instruction)
-        elif opcode == 0x0:  # BR (Branch)
-            self.BR(instruction)
-        elif opcode == 0xC:  # JMP
-            self.JMP(instruction)
-        elif opcode == 0x4:  # JSR
-            self.JSR(instruction)
-        elif opcode == 0xF:  # TRAP
-            self.TRAP(instruction)
-        elif opcode == 0xF:  # HALT
-            self.running = False
-        elif opcode == 0xA:
-            self.LDI(instruction)
-        elif opcode == 0xB:
-            self.STI(instruction)
-        else:
-            print("Unknown instruction {:04X}".format(instruction))
-            self.running = False
+        handler, operands = self.decode(instruction)
+        handler(*operands)
 
-    def ADD(self, instruction):
-        """ Handle the ADD instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        src1 = (instruction >> 6) & 0x7  # First source register
-        imm_flag = (instruction >> 5) & 0x1  # Immediate mode flag
+    def unknown(self, instruction):
+        # Not a trace: the only sign of why the program stopped
+        print("Unknown instruction {:04X}".format(instruction))
+        self.running = False
 
-        print("ADD R{} <- R{} + ".format(dest, src1), end="")
+    def ADD(self, dest, src1, imm_flag, operand):
+        """ Handle the ADD instruction """
         if imm_flag == 1:  # Immediate mode
-            imm5 = instruction & 0x1F  # 5-bit immediate value
-            if imm5 & 0x10:  # Sign-extend if negative
-                imm5 -= 0x20
-            self.registers[dest] = self.registers[src1] + imm5
-            print("#{:d}".format(imm5))
+            self.registers[dest] = self.registers[src1] + operand
         else:  # Register mode
-            src2 = instruction & 0x7  # Second source register
-            self.registers[dest] = self.registers[src1] + self.registers[src2]
-            print("R{}".format(src2))
-        
+            self.registers[dest] = self.registers[src1] + self.registers[operand]
         self.update_CC(self.registers[dest])
 
-    def AND(self, instruction):
+    def AND(self, dest, src1, imm_flag, operand):
         """ Handle the AND instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        src1 = (instruction >> 6) & 0x7  # First source register
-        imm_flag = (instruction >> 5) & 0x1  # Immediate mode flag
-        
-        print("AND R{} <- R{} & ".format(dest, src1), end="")
-
         if imm_flag == 1:  # Immediate mode
-            imm5 = instruction & 0x1F
-            if imm5 & 0x10:  # Sign-extend if negative
-                imm5 -= 0x20
-            self.registers[dest] = self.registers[src1] & imm5
-            print("#{:d}".format(imm5))
+            self.registers[dest] = self.registers[src1] & operand
         else:  # Register mode
-            src2 = instruction & 0x7  # Second source register
-            self.registers[dest] = self.registers[src1] & self.registers[src2]
-            print("R{}".format(src2))
+            self.registers[dest] = self.registers[src1] & self.registers[operand]
         self.update_CC(self.registers[dest])
 
-    def NOT(self, instruction):
+    def NOT(self, dest, src):
         """ Handle the NOT instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        src = (instruction >> 6) & 0x7  # Source register
-
-        print("NOT R{} <- R{}".format(dest, src))
-        
         self.registers[dest] = ~self.registers[src] & 0xFFFF  # Ensure 16-bit result
         self.update_CC(self.registers[dest])
 
-    def LD(self, instruction):
+    def LD(self, dest, offset):
         """ Handle the LD (Load) instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        offset = instruction & 0x1FF  # 9-bit signed offset
-        if offset & 0x100:  # Sign-extend
-            offset -= 0x200
         address = self.PC + offset
-
-        print("LD R{} <- M[{:04X}]".format(dest, address))
-
         self.registers[dest] = self.memory[address]
         self.update_CC(self.registers[dest])
 
-    def ST(self, instruction):
+    def ST(self, src, offset):
         """ Handle the ST (Store) instruction """
-        src = (instruction >> 9) & 0x7  # Source register
-        offset = instruction & 0x1FF  # 9-bit signed offset
-        # print(f"offset: {self.PC + offset:04X}")
-        if offset & 0x100:  # Sign-extend
-            offset -= 0x200
         address = self.PC + offset
-        
-        print("ST M[{:04X}] <- R{}".format(address, src))
-        
         self.memory[address] = self.registers[src]
 
-    def LDR(self, instruction):
+    def LDR(self, dest, base, offset):
         """ Handle the LDR (Load Register) instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        base = (instruction >> 6) & 0x7  # Base register
-        offset = instruction & 0x3F  # 6-bit signed offset
-        if offset & 0x20:  # Sign-extend
-            offset -= 0x40
-        
-        print("LDR R{} <- M[R{} + #{:d}]".format(dest, base, offset))
-        
         address = self.registers[base] + offset
         self.registers[dest] = self.memory[address]
         self.update_CC(self.registers[dest])
 
-    def STR(self, instruction):
+    def STR(self, src, base, offset):
         """ Handle the STR (Store Register) instruction """
-        src = (instruction >> 9) & 0x7  # Source register
-        base = (instruction >> 6) & 0x7  # Base register
-        offset = instruction & 0x3F  # 6-bit signed offset
-        if offset & 0x20:  # Sign-extend
-            offset -= 0x40
-
-        print("STR M[R{} + #{:d}] <- R{}".format(base, offset, src))
-
         address = self.registers[base] + offset
         self.memory[address] = self.registers[src]
 
-    def LEA(self, instruction):
+    def LEA(self, dest, offset):
         """ Handle the LEA (Load Effective Address) instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        offset = instruction & 0x1FF  # 9-bit signed offset
-        if offset & 0x100:  # Sign-extend
-            offset -= 0x200
-
-        print("LEA R{} <- {:04X} + #{:d}]".format(dest, self.PC, offset))
-
         self.registers[dest] = self.PC + offset
         self.update_CC(self.registers[dest])
 
-    def LDI(self, instruction):
+    def LDI(self, dest, offset):
         """ Handle the LDI (Load Immediate) instruction """
-        dest = (instruction >> 9) & 0x7  # Destination register
-        offset = instruction & 0x1FF  # 9-bit signed offset
-        if offset & 0x100:  # Sign-extend
-            offset -= 0x200
-
-        print("LDI R{} <- M[M[{:04X} + #{:d}]]".format(dest, self.PC, offset))
-
         temp_address = self.PC + offset
         final_address = self.memory[temp_address]
         self.registers[dest] = self.memory[final_address]
         self.update_CC(self.registers[dest])
 
-    def STI(self, instruction):
+    def STI(self, source, offset):
         """ Handle the STI (Store Immediate) instruction """
-        source = (instruction >> 9) & 0x7  # Destination register
-        offset = instruction & 0x1FF  # 9-bit signed offset
-
-        if offset & 0x100:  # Sign-extend
-            offset -= 0x200
-
-        print("STI M[M[{:04X} + #{:d}]] <- R{}".format(self.PC, offset, source))
-
         temp_address = self.PC + offset
         final_address = self.memory[temp_address]
         self.memory[final_address] = self.registers[source]
 
-    def BR(self, instruction):
-        # print("BR")
+    def BR(self, cond, offset):
         """ Handle the BR (Branch) instruction """
-        cond = (instruction >> 9) & 0x7  # Condition codes
-        offset = instruction & 0x1FF  # 9-bit signed offset
-        if offset & 0x100:  # Sign-extend
-            offset -= 0x200
-
-        print("BR{:03b} PC <- PC + #{:d}".format(cond, offset), end="")
-
-        if ((cond & 0x4 and self.CC == 'N') or
-            (cond & 0x2 and self.CC == 'Z') or
-            (cond & 0x1 and self.CC == 'P')):
+        if branch_taken(cond, self.CC):
             self.PC += offset
-            print(":T")
-        else:
-            print(":F")
 
-    def JMP(self, instruction):
+    def JMP(self, base):
         """ Handle the JMP (Jump) instruction """
-        base = (instruction >> 6) & 0x7  # Base register
-        print("JMP PC <- R{}".format(base))
         self.PC = self.registers[base]
 
-    def JSR(self, instruction):
-        print("JSR")
+    def JSR(self, use_offset, operand):
         """ Handle the JSR (Jump to Subroutine) instruction """
         self.registers[7] = self.PC  # Link register (R7)
-
-        print("JSR PC <- {:04X} + ".format(self.PC), end="")
-
-        use_offset = (instruction >> 11) & 0x1  # Link flag
         if use_offset:
-            offset = instruction & 0x7FF  # 11-bit signed offset
-            if offset & 0x400:  # Sign-extend
-                offset -= 0x800
-            self.PC += offset
-            print("#{:d}]".format(offset))
+            self.PC += operand
         else:
-            baseR = (instruction >> 6) & 0x7
-            self.PC = self.registers[baseR]
-            print("R{}".format(baseR))
-            
+            self.PC = self.registers[operand]
 
-    def TRAP(self, instruction):
+    def TRAP(self, trap_vector):
         """ Handle the TRAP instruction (system calls) """
-        trap_vector = instruction & 0xFF
         if trap_vector == 0x25:
             self.running = False
-        print("TRAP {:04X}".format(trap_vector))
         self.PC = trap_vector  # Jump to the trap vector
 
     def update_CC(self, value):
@@ -268,20 +447,26 @@ class LC3Simulator:
         else:
             self.CC = 'P'  # Positive
 
-    def run(self):
-        """ Run the LC-3 program """
-        skip = "2" == input("Enter [2] to run all\n")
+    def run(self, interactive=True):
+        """ Run the LC-3 program (without interactive, straight through with no prompts or debugger) """
+        skip = not interactive or "2" == input("Enter [2] to run all\n")
         # print("Enter [2] to stop execution at any time")
         
         program_addr = 0
         
         self.ADDR = self.PC
+        counting = self.trace_level != 'off'
+        # Stepping shows each instruction on the console instead of tracing it
+        full = self.trace_level == 'full' and skip
+        trace = self.trace
+        decoded = self.memory.decoded
+        flush_at = TRACE_FLUSH_RECORDS if self.trace_output is not None else None
 
         while self.running:
             instruction = self.fetch()
-            print("{:04X}:{:04X} ".format(self.ADDR, instruction), end="")
 
             if skip == False:
+                print(format_trace_record((self.ADDR & 0xFFFF, instruction, self.CC)), end=" ")
                 inp = input("")
                 if "2" == inp:
                     self.running = False
@@ -289,20 +474,29 @@ class LC3Simulator:
                 elif "3" == inp:
                     self.debug()
 
-            else:
-                print("")
-
             if instruction == 0:
                 print("Done!")
                 self.PC = self.ADDR
                 break
-            self.decode_execute(instruction)
+            if counting:
+                self.opcode_counts[instruction >> 12] += 1
+                if full:
+                    trace.append((self.ADDR & 0xFFFF, instruction, self.CC))
+                    if len(trace) == flush_at:
+                        self.flush_trace()
+            handler, operands = decoded.get(self.ADDR) or self.predecode(self.ADDR)
+            handler(*operands)
             program_addr += 1
             self.ADDR = self.PC
 
+        self.flush_trace()
+        if counting:
+            print(self.trace_summary())
+
         # When halted, show state of registers
-        self.debug()
-        self.print_registers()
+        if interactive:
+            self.debug()
+            self.print_registers()
 
     def debug(self):
         while True:
@@ -324,6 +518,9 @@ class LC3Simulator:
                 self.inspect_memory(int(inp, 16))
             elif "3" == inp:
                 break
+            elif "4" == inp:
+                for line in self.trace_lines():
+                    print(line)
             else:
                 break
 
@@ -355,9 +552,7 @@ class LC3Simulator:
         """ Inspect a specific memory address """
         print("{:04X}:{:04X}".format(address, self.memory[address]))
 
-simulator = LC3Simulator()
-
-def request_initial_state():
+def request_initial_state(simulator):
     addr = input("Enter Start Addr\n")
     addr = addr.strip().lower().replace(" ", "")
     
@@ -425,7 +620,44 @@ def request_initial_state():
             print("R{} <- 0x{:04X}".format(int(register), int(value, 16)))
         
     simulator.debug()
-    
-# if __name__ == "__main__":
-request_initial_state()
-simulator.run()
\ No newline at end of file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LC-3 simulator")
+    parser.add_argument('program', nargs='?',
+                        help="object file, hex/binary text listing or raw 128 KiB memory image (prompts for the program without one)")
+    parser.add_argument('--format', choices=['obj', 'text', 'image'], help="program file format (default: from the extension)")
+    parser.add_argument('--reg', action='append', default=[], metavar='NAME=VALUE',
+                        help="register preset such as R1=x10, PC=x3000 or CC=P (repeatable)")
+    parser.add_argument('--trace', choices=TRACE_LEVELS, default='full', help="what to record of each instruction run")
+    parser.add_argument('--trace-file', metavar='FILE', help="write the full trace to FILE instead of stdout")
+    parser.add_argument('--binary-trace', action='store_true', help="write packed binary trace records")
+    args = parser.parse_args(argv)
+
+    if args.trace_file:
+        trace_output = open(args.trace_file, 'wb' if args.binary_trace else 'w')
+    else:
+        trace_output = sys.stdout.buffer if args.binary_trace else sys.stdout
+    simulator = LC3Simulator(args.trace, trace_output, binary_trace=args.binary_trace)
+
+    presets = {}
+    for preset in args.reg:
+        name, _, value = preset.partition('=')
+        name = name.strip()
+        presets[name] = value.strip().upper() if name.upper() == 'CC' else parse_value(value)
+
+    try:
+        if args.program is None:
+            request_initial_state(simulator)
+            simulator.set_registers(presets)
+            simulator.run()
+        else:
+            simulator.load_file(args.program, args.format)
+            simulator.set_registers(presets)
+            simulator.run(interactive=False)
+            simulator.print_registers()
+    finally:
+        if args.trace_file:
+            trace_output.close()
+
+if __name__ == "__main__":
+    main()